@@ -27,6 +27,7 @@ def load_schema() -> Dict[str, Any]:
     """Load the combined questionnaire schema from local form files."""
 
     combined, _, _ = load_combined_schema()
+    combined[questionnaire_utils.SCHEMA_DIGEST_KEY] = questionnaire_utils.schema_digest(combined)
     return combined
 
 
@@ -3,12 +3,84 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
-from dataclasses import dataclass
-from typing import Any, Dict, Optional
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
 
 import requests
 
+try:  # pragma: no cover - optional faster JSON encoder
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
+
+_NON_ASCII = re.compile(r"[^\x00-\x7e]")
+
+
+def _escape_non_ascii(match: "re.Match[str]") -> str:
+    """Return the ``\\uXXXX`` escape ``json.dumps`` emits for one character."""
+
+    code = ord(match.group(0))
+    if code < 0x10000:
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def _has_unportable_float(data: Any) -> bool:
+    """Return whether ``data`` holds a float ``orjson`` formats unlike the stdlib.
+
+    ``orjson`` writes exponents without a sign or padding (``1e16`` rather
+    than ``1e+16``) and turns non-finite values into ``null``.
+    """
+
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value) or "e" in repr(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+
+def dumps_json(data: Any) -> bytes:
+    """Serialise ``data`` as two-space indented, ASCII-escaped JSON.
+
+    Uses ``orjson`` when installed and escapes its non-ASCII output so the
+    bytes match ``json.dumps(data, indent=2)``, which earlier versions wrote
+    and whose blob SHAs are stored on GitHub. The standard-library encoder is
+    the fallback, also for payloads ``orjson`` rejects (non-string keys,
+    oversized integers) or would format differently (exponent-form and
+    non-finite floats).
+    """
+
+    if orjson is not None and not _has_unportable_float(data):
+        try:
+            encoded = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            pass
+        else:
+            if encoded.isascii() and b"\x7f" not in encoded:
+                return encoded
+            text = _NON_ASCII.sub(_escape_non_ascii, encoded.decode("utf-8"))
+            return text.encode("ascii")
+    return json.dumps(data, indent=2).encode("utf-8")
+
+
+def blob_sha(content: bytes) -> str:
+    """Return the git blob SHA GitHub reports for a file holding ``content``."""
+
+    header = f"blob {len(content)}\0".encode("ascii")
+    return hashlib.sha1(header + content).hexdigest()
+
 
 @dataclass
 class GitHubBackend:
@@ -19,6 +91,11 @@ class GitHubBackend:
     path: str
     branch: str = "main"
     api_url: str = "https://api.github.com"
+    # Last ``(etag, sha)`` seen for the file, replaced as a single tuple so
+    # instances can be shared between sessions.
+    _sha_etag: Optional[Tuple[str, Optional[str]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def _headers(self) -> Dict[str, str]:
         """Build request headers for the GitHub API."""
@@ -35,19 +112,35 @@ class GitHubBackend:
         return f"{self.api_url.rstrip('/')}/repos/{self.repo}/contents/{self.path}"
 
     def _get_file_sha(self) -> Optional[str]:
-        """Retrieve the SHA of the target file if it exists."""
+        """Retrieve the SHA of the target file if it exists.
+
+        Repeat lookups send the previous ETag as ``If-None-Match``; GitHub
+        answers an unchanged file with 304, which does not count against the
+        rate limit.
+        """
+
+        headers = self._headers()
+        cached = self._sha_etag
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
 
         response = requests.get(
             self._url(),
-            headers=self._headers(),
+            headers=headers,
             params={"ref": self.branch},
             timeout=10,
         )
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
         if response.status_code == 404:
+            self._sha_etag = None
             return None
         response.raise_for_status()
         payload = response.json()
-        return payload.get("sha")
+        sha = payload.get("sha")
+        etag = response.headers.get("ETag")
+        self._sha_etag = (etag, sha) if etag else None
+        return sha
 
     def get_file_sha(self) -> Optional[str]:
         """Public wrapper for retrieving the SHA of the target file."""
@@ -79,7 +172,7 @@ class GitHubBackend:
         payload: Dict[str, Any] = {
             "message": message,
             "branch": self.branch,
-            "content": base64.b64encode(json.dumps(data, indent=2).encode("utf-8")).decode("utf-8"),
+            "content": base64.b64encode(dumps_json(data)).decode("utf-8"),
         }
 
         sha = self._get_file_sha()
@@ -166,7 +259,7 @@ def put_file(
     payload: Dict[str, Any] = {
         "message": message,
         "branch": target_branch,
-        "content": base64.b64encode(json.dumps(new_json, indent=2).encode("utf-8")).decode("utf-8"),
+        "content": base64.b64encode(dumps_json(new_json)).decode("utf-8"),
     }
     if sha:
         payload["sha"] = sha
@@ -15,7 +15,10 @@ RUNNER_SELECTED_STATE_KEY = "runner_selected_questionnaire"
 RECORD_NAME_FIELD = "_record_name"
 RECORD_NAME_KEY = "record_name"
 RECORD_NAME_TYPE = "record_name"
+SCHEMA_DIGEST_KEY = "_schema_digest"
 
+import hashlib
+import json
 from typing import Any, Dict, Iterable, List, Tuple
 
 __all__ = [
@@ -26,11 +29,13 @@ __all__ = [
     "RECORD_NAME_FIELD",
     "RECORD_NAME_KEY",
     "RECORD_NAME_TYPE",
+    "SCHEMA_DIGEST_KEY",
     "normalize_questionnaires",
     "questionnaire_choices",
     "get_questionnaire",
     "iter_questionnaires",
     "extract_record_name",
+    "schema_digest",
 ]
 
 
@@ -148,3 +153,15 @@ def extract_record_name(questionnaire: Dict[str, Any], answers: Dict[str, Any])
         return value.strip()
 
     return ""
+
+
+def schema_digest(schema: Dict[str, Any]) -> str:
+    """Return a short content hash identifying ``schema``.
+
+    Loaders store the digest under ``SCHEMA_DIGEST_KEY`` so pages can key
+    caches on it without re-serialising the schema on every rerun.
+    """
+
+    payload = {key: value for key, value in schema.items() if key != SCHEMA_DIGEST_KEY}
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
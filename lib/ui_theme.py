@@ -388,6 +388,17 @@ form[data-testid="stForm"] .stMarkdown p {
 """
 
 
+def _compact_css(markup: str) -> str:
+    """Collapse indentation and blank lines so the stylesheet is sent compactly."""
+
+    return " ".join(line.strip() for line in markup.splitlines() if line.strip())
+
+
+# The stylesheet has to be emitted on every rerun (Streamlit drops elements that
+# a run does not render), so compact it once at import to keep the delta small.
+_THEME_MARKUP = _compact_css(_THEME_CSS)
+
+
 def apply_app_theme(page_title: str, page_icon: Optional[str] = None) -> None:
     """Set up consistent page configuration and inject the shared CSS theme."""
 
@@ -397,7 +408,7 @@ def apply_app_theme(page_title: str, page_icon: Optional[str] = None) -> None:
         layout="wide",
         initial_sidebar_state="expanded",
     )
-    st.markdown(_THEME_CSS, unsafe_allow_html=True)
+    st.markdown(_THEME_MARKUP, unsafe_allow_html=True)
 
 
 def page_header(
@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import os
+import sys
 from collections.abc import Mapping
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from html import escape as html_escape
-from typing import Any, Dict, List, Optional, Sequence
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 import uuid
 
 import requests
 import streamlit as st
 
+try:  # pragma: no cover - optional faster JSON decoder
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
 try:  # pragma: no cover - compatibility shim for older ``Home`` modules
     import Home as _home_module
 except ImportError:  # pragma: no cover - legacy fallback
@@ -45,6 +56,7 @@ from lib.ui_theme import apply_app_theme, page_header
 DEFAULT_QUESTIONNAIRE_KEY = questionnaire_utils.DEFAULT_QUESTIONNAIRE_KEY
 RUNNER_SELECTED_STATE_KEY = questionnaire_utils.RUNNER_SELECTED_STATE_KEY
 normalize_questionnaires = questionnaire_utils.normalize_questionnaires
+SCHEMA_DIGEST_KEY = getattr(questionnaire_utils, "SCHEMA_DIGEST_KEY", "_schema_digest")
 
 # ``RECORD_NAME_FIELD`` and related constants were added in tandem with this page,
 # but older deployments may still import a version of ``questionnaire_utils``
@@ -55,6 +67,8 @@ RECORD_NAME_KEY = getattr(questionnaire_utils, "RECORD_NAME_KEY", "record_name")
 RECORD_NAME_TYPE = getattr(questionnaire_utils, "RECORD_NAME_TYPE", "record_name")
 UNSELECTED_LABEL = "— Select an option —"
 
+RulePredicate = Callable[[Dict[str, Any]], bool]
+
 
 def _fallback_extract_record_name(
     questionnaire: Dict[str, Any], answers: Dict[str, Any]
@@ -105,27 +119,42 @@ from lib.schema_defaults import (
 )
 
 
-@dataclass(frozen=True)
-class GHConfig:
-    """Configuration required to fetch a file from GitHub."""
+@dataclass(frozen=True, slots=True)
+class GHFetchKey:
+    """Identify a file to fetch from GitHub.
+
+    The access token is deliberately not part of the key so cached downloads
+    stay valid when the token is rotated and hashing the key stays cheap.
+    """
 
     repo: str
     path: str
     ref: str = "main"
-    token: Optional[str] = None
 
 
-def _secrets_dict(name: str) -> Dict[str, Any]:
-    """Return a mapping stored under ``name`` in Streamlit secrets."""
+@functools.lru_cache(maxsize=32)
+def _fetch_key(repo: str, path: str, ref: str) -> GHFetchKey:
+    """Return a shared :class:`GHFetchKey` instance for ``repo``/``path``/``ref``."""
+
+    return GHFetchKey(repo=repo, path=path, ref=ref)
+
+
+def _secrets_dict(name: str) -> Mapping[str, Any]:
+    """Return the read-only mapping stored under ``name`` in Streamlit secrets."""
 
     value = st.secrets.get(name, {})  # type: ignore[arg-type]
     if isinstance(value, Mapping):
-        return dict(value)
+        return value
     return {}
 
 
-def _github_settings() -> Dict[str, Any]:
-    """Return GitHub configuration from secrets in a normalised structure."""
+@st.cache_resource(show_spinner=False)
+def _github_settings() -> Mapping[str, Any]:
+    """Return GitHub configuration from secrets in a normalised structure.
+
+    Secrets are static for the lifetime of the server process, so the result is
+    resolved once and shared read-only between sessions and reruns.
+    """
 
     secrets = _secrets_dict("github")
     repo = secrets.get("repo")
@@ -137,9 +166,9 @@ def _github_settings() -> Dict[str, Any]:
     submissions_path = secrets.get("system_registration_submissions_path")
     assessment_submissions_path = secrets.get("assessment_submissions_path")
 
-    configured_forms: List[str] = []
+    configured_forms: Tuple[str, ...] = ()
     if isinstance(forms_config, Sequence) and not isinstance(forms_config, (str, bytes)):
-        configured_forms = [str(item).strip() for item in forms_config if str(item).strip()]
+        configured_forms = tuple(str(item).strip() for item in forms_config if str(item).strip())
 
     if not (repo and path):
         repo = st.secrets.get("github_repo", repo)
@@ -150,7 +179,9 @@ def _github_settings() -> Dict[str, Any]:
     if not configured_forms:
         secrets_forms = st.secrets.get("github_forms")
         if isinstance(secrets_forms, Sequence) and not isinstance(secrets_forms, (str, bytes)):
-            configured_forms = [str(item).strip() for item in secrets_forms if str(item).strip()]
+            configured_forms = tuple(
+                str(item).strip() for item in secrets_forms if str(item).strip()
+            )
     if not submissions_path:
         submissions_path = st.secrets.get(
             "github_system_registration_submissions_path",
@@ -162,32 +193,170 @@ def _github_settings() -> Dict[str, Any]:
             st.secrets.get("assessment_submissions_path", assessment_submissions_path),
         )
 
-    if repo and path:
-        return {
-            "repo": repo,
-            "path": path,
-            "branch": branch,
-            "token": token,
-            "forms": configured_forms,
-            "api_url": api_url,
-            "system_registration_submissions_path": submissions_path,
-            "assessment_submissions_path": assessment_submissions_path,
-        }
+    if not (repo and path):
+        return MappingProxyType({})
+    settings = {
+        "repo": repo,
+        "path": path,
+        "branch": branch,
+        "token": token,
+        "forms": configured_forms,
+        "api_url": api_url,
+        "system_registration_submissions_path": submissions_path,
+        "assessment_submissions_path": assessment_submissions_path,
+    }
+    return MappingProxyType(settings)
+
+
+SCHEMA_CACHE_DIR = Path.home() / ".cache" / "assessment-ai"
+
+
+def _disk_cache_paths(key: GHFetchKey) -> Tuple[Path, Path]:
+    """Return the body and ETag file paths used to persist ``key`` on disk."""
+
+    name = hashlib.sha256(f"{key.repo}/{key.ref}/{key.path}".encode("utf-8")).hexdigest()
+    return SCHEMA_CACHE_DIR / f"{name}.json", SCHEMA_CACHE_DIR / f"{name}.etag"
+
+
+def _read_disk_cache(key: GHFetchKey) -> Optional[Tuple[str, bytes]]:
+    """Return the ``(etag, body)`` persisted for ``key``, if any."""
+
+    body_path, etag_path = _disk_cache_paths(key)
+    try:
+        etag = etag_path.read_text(encoding="utf-8").strip()
+        body = body_path.read_bytes()
+    except OSError:
+        return None
+    return (etag, body) if etag else None
+
+
+def _write_disk_cache(key: GHFetchKey, etag: str, body: bytes) -> None:
+    """Persist ``body`` and its ``etag`` for ``key``, ignoring filesystem errors.
+
+    Each file is written to a temporary sibling first and moved into place so
+    a concurrent reader never sees a partially written body.
+    """
+
+    body_path, etag_path = _disk_cache_paths(key)
+    try:
+        SCHEMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for path, payload in ((body_path, body), (etag_path, etag.encode("utf-8"))):
+            temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            temp_path.write_bytes(payload)
+            os.replace(temp_path, path)
+    except OSError:
+        pass
+
+
+@st.cache_resource(show_spinner=False)
+def _etag_store() -> Dict[GHFetchKey, Tuple[str, bytes]]:
+    """Return the process-wide ``key -> (etag, body)`` store for conditional requests."""
+
     return {}
 
 
+@st.cache_resource(show_spinner=False)
+def _http_session() -> requests.Session:
+    """Return a shared HTTP session so GitHub downloads reuse pooled connections."""
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4)
+    session.mount("https://", adapter)
+    return session
+
+
 @st.cache_data(ttl=60, show_spinner=False)
-def get_file(config: GHConfig) -> str:
-    """Download a file from GitHub using the raw content endpoint."""
+def get_file(key: GHFetchKey) -> bytes:
+    """Download a file from GitHub.
 
-    headers = {"Accept": "application/vnd.github.v3.raw"}
-    if config.token:
-        headers["Authorization"] = f"Bearer {config.token}"
+    Without a token the raw content endpoint is used, which is not subject to
+    the unauthenticated REST API rate limit. With a token the Contents API raw
+    media type is used instead, where GitHub does not count ``304`` responses
+    to authorized requests against the rate limit.
 
-    url = f"https://raw.githubusercontent.com/{config.repo}/{config.ref}/{config.path}"
-    response = requests.get(url, headers=headers, timeout=10)
+    Both endpoints return ETags, so requests are made conditionally with
+    ``If-None-Match`` and an unchanged file is revalidated instead of being
+    downloaded again once the short cache expires. The last body and ETag are
+    also persisted under :data:`SCHEMA_CACHE_DIR` so revalidation survives
+    server restarts.
+    """
+
+    settings = _github_settings()
+    headers = {"Accept": "application/vnd.github.v3.raw"}
+    token = settings.get("token")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+
+    store = _etag_store()
+    cached = store.get(key)
+    if cached is None:
+        cached = _read_disk_cache(key)
+    if cached is not None:
+        headers["If-None-Match"] = cached[0]
+
+    if token:
+        api_url = (settings.get("api_url") or "https://api.github.com").rstrip("/")
+        url = f"{api_url}/repos/{key.repo}/contents/{key.path}"
+        params: Optional[Dict[str, str]] = {"ref": key.ref}
+    else:
+        url = f"https://raw.githubusercontent.com/{key.repo}/{key.ref}/{key.path}"
+        params = None
+    response = _http_session().get(url, headers=headers, params=params, timeout=10)
+    if response.status_code == 304 and cached is not None:
+        store[key] = cached
+        return cached[1]
     response.raise_for_status()
-    return response.text
+
+    # The raw bytes are handed straight to the JSON decoder, which skips the
+    # charset detection ``response.text`` would fall back to.
+    body = response.content
+    etag = response.headers.get("ETag")
+    if etag:
+        store[key] = (etag, body)
+        _write_disk_cache(key, etag, body)
+    else:
+        store.pop(key, None)
+    return body
+
+
+def _decode_json(contents: bytes) -> Any:
+    """Decode ``contents`` with ``orjson`` when available, else the stdlib.
+
+    ``orjson.JSONDecodeError`` subclasses ``json.JSONDecodeError`` so callers
+    only need to handle the stdlib exception.
+    """
+
+    if orjson is not None:
+        return orjson.loads(contents)
+    return json.loads(contents)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_remote_schema(
+    repo: str, path: str, ref: str, form_keys: Tuple[str, ...]
+) -> Dict[str, Any]:
+    """Download and parse the forms identified by ``form_keys``.
+
+    Caching the combined, parsed schema means reruns skip JSON decoding and
+    form normalisation as well as the download.
+    """
+
+    payloads: Dict[str, Dict[str, Any]] = {}
+    for form_key in form_keys:
+        key = _fetch_key(repo, resolve_remote_form_path(path, form_key), ref)
+        payload = _decode_json(get_file(key))
+        if not isinstance(payload, dict):
+            raise ValueError(f"Form '{form_key}' on GitHub is not a JSON object.")
+        payloads[form_key] = payload
+
+    forms = forms_from_payloads(payloads)
+    for form_key, form in forms.items():
+        if not all(isinstance(question, dict) for question in form["questions"]):
+            raise ValueError(f"Form '{form_key}' on GitHub has malformed questions.")
+
+    schema = combine_forms(forms)
+    schema[SCHEMA_DIGEST_KEY] = questionnaire_utils.schema_digest(schema)
+    return schema
 
 
 def load_schema_from_github() -> Dict[str, Any]:
@@ -197,7 +366,6 @@ def load_schema_from_github() -> Dict[str, Any]:
     repo = github_settings.get("repo")
     path = github_settings.get("path")
     ref = github_settings.get("branch", "main")
-    token = github_settings.get("token")
     configured_forms = github_settings.get("forms") or []
 
     if not repo or not path:
@@ -207,18 +375,8 @@ def load_schema_from_github() -> Dict[str, Any]:
     if not form_keys:
         return {}
 
-    payloads: Dict[str, Dict[str, Any]] = {}
-    for form_key in form_keys:
-        config = GHConfig(
-            repo=repo,
-            path=resolve_remote_form_path(path, form_key),
-            ref=ref,
-            token=token,
-        )
-        contents = get_file(config)
-        payloads[form_key] = json.loads(contents)
+    return _load_remote_schema(repo, path, ref, tuple(form_keys))
 
-    return combine_forms(forms_from_payloads(payloads))
 
 ANSWERS_STATE_KEY = "questionnaire_answers"
 QUESTIONNAIRE_QUERY_PARAM = "questionnaire"
@@ -232,7 +390,7 @@ DEFAULT_ASSESSMENT_SUBMISSIONS_PATH = "assessment/submissions/{submission_id}.js
 
 def _submission_storage_path(
     *,
-    settings: Dict[str, Any],
+    settings: Mapping[str, Any],
     submission_id: str,
     template_key: str,
     default_template: str,
@@ -251,7 +409,7 @@ def _submission_storage_path(
         return None
 
 
-def _system_registration_submission_path(settings: Dict[str, Any], submission_id: str) -> Optional[str]:
+def _system_registration_submission_path(settings: Mapping[str, Any], submission_id: str) -> Optional[str]:
     """Build the storage path for a system registration submission."""
 
     return _submission_storage_path(
@@ -263,7 +421,7 @@ def _system_registration_submission_path(settings: Dict[str, Any], submission_id
     )
 
 
-def _assessment_submission_path(settings: Dict[str, Any], submission_id: str) -> Optional[str]:
+def _assessment_submission_path(settings: Mapping[str, Any], submission_id: str) -> Optional[str]:
     """Build the storage path for an assessment submission."""
 
     return _submission_storage_path(
@@ -298,10 +456,65 @@ def _extract_related_system_id(answers: Mapping[str, Any]) -> str:
     return ""
 
 
-def _collect_triggered_risks(
-    answers: Dict[str, Any], *, system_id: str = ""
-) -> List[Dict[str, Any]]:
-    """Return risks whose logic evaluates to ``True`` for ``answers``."""
+def _risk_entry(risk: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the cleaned fields of ``risk`` that are stored with a submission."""
+
+    entry: Dict[str, Any] = {}
+    key = risk.get("key")
+    name = risk.get("name")
+    level = risk.get("level")
+    mitigations = risk.get("mitigations")
+
+    if isinstance(key, str) and key.strip():
+        entry["key"] = key.strip()
+    if isinstance(name, str) and name.strip():
+        entry["name"] = name.strip()
+    if isinstance(level, str) and level.strip():
+        entry["level"] = level.strip()
+    if isinstance(mitigations, list):
+        cleaned_mitigations = [
+            str(item).strip()
+            for item in mitigations
+            if isinstance(item, str) and str(item).strip()
+        ]
+        if cleaned_mitigations:
+            entry["mitigations"] = cleaned_mitigations
+    return entry
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _compiled_risks(
+    digest: str, _risks: Sequence[Any]
+) -> Tuple[Tuple[Dict[str, Any], RulePredicate], ...]:
+    """Return ``(entry, predicate)`` pairs for the risks of schema ``digest``.
+
+    Keying on the schema digest lets repeated submissions reuse the cleaned
+    entries and normalised logic instead of rebuilding them for every call.
+    """
+
+    compiled: List[Tuple[Dict[str, Any], RulePredicate]] = []
+    for risk in _risks:
+        if not isinstance(risk, dict):
+            continue
+
+        logic = risk.get("logic")
+        if isinstance(logic, Sequence) and not isinstance(logic, (str, bytes, dict)):
+            logic = {"all": list(logic)}
+        if logic is None:
+            continue
+        if not isinstance(logic, dict):
+            continue
+
+        try:
+            predicate = _rule_predicate(logic)
+        except Exception:  # pragma: no cover - guard against malformed rules
+            continue
+        compiled.append((_risk_entry(risk), predicate))
+    return tuple(compiled)
+
+
+def _assessment_risks() -> Tuple[str, List[Any]]:
+    """Return the schema digest and risk definitions of the local assessment."""
 
     try:
         schema = load_schema()
@@ -309,7 +522,7 @@ def _collect_triggered_risks(
         schema = {}
 
     if not isinstance(schema, dict):
-        return []
+        return "", []
 
     try:
         questionnaire = questionnaire_utils.get_questionnaire(schema, DEFAULT_QUESTIONNAIRE_KEY)
@@ -318,49 +531,35 @@ def _collect_triggered_risks(
 
     risks = questionnaire.get("risks", [])
     if not isinstance(risks, list):
-        return []
+        return "", []
+    digest = schema.get(SCHEMA_DIGEST_KEY) or questionnaire_utils.schema_digest(schema)
+    return digest, risks
 
-    triggered: List[Dict[str, Any]] = []
-    for risk in risks:
-        if not isinstance(risk, dict):
-            continue
 
-        logic = risk.get("logic")
-        if isinstance(logic, Sequence) and not isinstance(logic, (str, bytes, dict)):
-            logic = {"all": list(logic)}
-        if logic is None:
-            continue
-        if not isinstance(logic, dict):
-            continue
+def _collect_triggered_risks(
+    answers: Dict[str, Any],
+    digest: str,
+    risks: Sequence[Any],
+    *,
+    system_id: str = "",
+) -> List[Dict[str, Any]]:
+    """Return the ``risks`` of schema ``digest`` whose logic holds for ``answers``."""
 
+    triggered: List[Dict[str, Any]] = []
+    for risk_entry, predicate in _compiled_risks(digest, risks):
         try:
-            is_triggered = eval_rule(logic, answers)
+            is_triggered = predicate(answers)
         except Exception:  # pragma: no cover - guard against malformed rules
             continue
 
         if not is_triggered:
             continue
 
-        entry: Dict[str, Any] = {}
-        key = risk.get("key")
-        name = risk.get("name")
-        level = risk.get("level")
-        mitigations = risk.get("mitigations")
-
-        if isinstance(key, str) and key.strip():
-            entry["key"] = key.strip()
-        if isinstance(name, str) and name.strip():
-            entry["name"] = name.strip()
-        if isinstance(level, str) and level.strip():
-            entry["level"] = level.strip()
-        if isinstance(mitigations, list):
-            cleaned_mitigations = [
-                str(item).strip()
-                for item in mitigations
-                if isinstance(item, str) and str(item).strip()
-            ]
-            if cleaned_mitigations:
-                entry["mitigations"] = cleaned_mitigations
+        # Copy nested lists too so callers cannot modify the cached entries.
+        entry = {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in risk_entry.items()
+        }
         if system_id:
             entry["system_id"] = system_id
 
@@ -442,8 +641,14 @@ def store_assessment_submission(
     answers: Dict[str, Any],
     *,
     record_name: Optional[str] = None,
+    digest: str = "",
+    risks: Optional[Sequence[Any]] = None,
 ) -> Optional[str]:
-    """Persist an assessment submission to GitHub and return its ID."""
+    """Persist an assessment submission to GitHub and return its ID.
+
+    ``risks`` are the risk definitions of the schema identified by ``digest``;
+    when omitted they are read from the local assessment schema.
+    """
 
     settings = _github_settings()
     token = settings.get("token")
@@ -470,8 +675,12 @@ def store_assessment_submission(
     triggered_risks: List[Dict[str, Any]] = []
     if isinstance(serialisable_answers, dict):
         related_system_id = _extract_related_system_id(serialisable_answers)
+        if risks is None:
+            digest, risks = _assessment_risks()
+        elif not digest:
+            digest = questionnaire_utils.schema_digest({"risks": list(risks)})
         triggered_risks = _collect_triggered_risks(
-            serialisable_answers, system_id=related_system_id
+            serialisable_answers, digest, risks, system_id=related_system_id
         )
         extracted_name = serialisable_answers.pop(RECORD_NAME_FIELD, None)
         if related_system_id:
@@ -536,69 +745,220 @@ def _normalise_paragraphs(value: Any) -> List[str]:
     return []
 
 
-def eval_clause(clause: Dict[str, Any], answers: Dict[str, Any]) -> bool:
-    """Evaluate a single rule clause against the current answers."""
+# Answers captured by the Streamlit widgets are always concrete lists, so the
+# hot path checks against these types instead of the slower ``Sequence`` ABC.
+_LIST_TYPES = (list, tuple)
 
-    operator = clause.get("operator", "equals")
-    field = clause.get("field")
-    expected = clause.get("value")
 
-    if field is None and operator != "always":
-        st.warning("Rule clause missing 'field'.")
-        return False
-
-    value = answers.get(field)
+def _is_expected_sequence(expected: Any) -> bool:
+    """Return ``True`` if a schema-supplied ``expected`` value is a non-string sequence."""
 
-    if operator == "always":
+    if isinstance(expected, _LIST_TYPES):
         return True
-    if operator == "equals":
-        return value == expected
-    if operator == "not_equals":
-        return value != expected
-    if operator == "includes":
+    return isinstance(expected, Sequence) and not isinstance(expected, str)
+
+
+def _frozen_items(expected: Sequence[Any]) -> Optional[frozenset]:
+    """Return ``expected`` as a ``frozenset``, or ``None`` if it is unhashable."""
+
+    try:
+        return frozenset(expected)
+    except TypeError:
+        return None
+
+
+def _always(_answers: Dict[str, Any]) -> bool:
+    return True
+
+
+def _compile_equals(field: Any, expected: Any) -> RulePredicate:
+    """Match when the answer equals ``expected``."""
+
+    return lambda answers: answers.get(field) == expected
+
+
+def _compile_not_equals(field: Any, expected: Any) -> RulePredicate:
+    """Match when the answer differs from ``expected``."""
+
+    return lambda answers: answers.get(field) != expected
+
+
+def _compile_includes(field: Any, expected: Any) -> RulePredicate:
+    """Match when the answer is, or contains, ``expected``."""
+
+    def _includes(answers: Dict[str, Any]) -> bool:
+        value = answers.get(field)
         if value is None:
             return False
         if isinstance(value, (list, tuple, set)):
             return expected in value
         return value == expected
-    if operator == "not_includes":
+
+    return _includes
+
+
+def _compile_not_includes(field: Any, expected: Any) -> RulePredicate:
+    """Match when the answer neither is nor contains ``expected``."""
+
+    def _not_includes(answers: Dict[str, Any]) -> bool:
+        value = answers.get(field)
         if value is None:
             return True
         if isinstance(value, (list, tuple, set)):
             return expected not in value
         return value != expected
-    if operator == "any_selected":
-        if not isinstance(value, Sequence) or isinstance(value, str):
-            return False
-        if not isinstance(expected, Sequence) or isinstance(expected, str):
+
+    return _not_includes
+
+
+def _compile_any_selected(field: Any, expected: Any) -> RulePredicate:
+    """Match when a list answer shares an item with ``expected``."""
+
+    if not _is_expected_sequence(expected):
+        return lambda answers: False
+    expected_items = _frozen_items(expected)
+
+    def _any_selected(answers: Dict[str, Any]) -> bool:
+        value = answers.get(field)
+        if not isinstance(value, _LIST_TYPES):
             return False
+        if expected_items is not None:
+            try:
+                return not expected_items.isdisjoint(value)
+            except TypeError:
+                pass
         return any(item in value for item in expected)
-    if operator == "contains_any":
-        if expected is None:
+
+    return _any_selected
+
+
+def _compile_all_selected(field: Any, expected: Any) -> RulePredicate:
+    """Match when a list answer contains every item of ``expected``."""
+
+    if not _is_expected_sequence(expected):
+        return lambda answers: False
+    expected_items = _frozen_items(expected)
+
+    def _all_selected(answers: Dict[str, Any]) -> bool:
+        value = answers.get(field)
+        if not isinstance(value, _LIST_TYPES):
             return False
-        if isinstance(expected, Sequence) and not isinstance(expected, str):
-            expected_values = list(expected)
-        else:
-            expected_values = [expected]
+        if expected_items is not None:
+            try:
+                return expected_items.issubset(value)
+            except TypeError:
+                pass
+        return all(item in value for item in expected)
+
+    return _all_selected
 
+
+def _compile_contains_any(field: Any, expected: Any) -> RulePredicate:
+    """Match when the answer text or list contains any ``expected`` value."""
+
+    if expected is None:
+        return lambda answers: False
+    expected_values = tuple(expected) if _is_expected_sequence(expected) else (expected,)
+    expected_text = tuple(item for item in expected_values if isinstance(item, str))
+
+    def _contains_any(answers: Dict[str, Any]) -> bool:
+        value = answers.get(field)
         if isinstance(value, str):
-            return any(isinstance(item, str) and item in value for item in expected_values)
-        if isinstance(value, Sequence) and not isinstance(value, str):
+            return any(item in value for item in expected_text)
+        if isinstance(value, _LIST_TYPES):
             return any(item in value for item in expected_values)
         return False
-    if operator == "all_selected":
-        if not isinstance(value, Sequence) or isinstance(value, str):
+
+    return _contains_any
+
+
+def _compile_is_true(field: Any, expected: Any) -> RulePredicate:
+    """Match when the answer is truthy."""
+
+    return lambda answers: bool(answers.get(field)) is True
+
+
+def _compile_is_false(field: Any, expected: Any) -> RulePredicate:
+    """Match when the answer is falsy."""
+
+    return lambda answers: bool(answers.get(field)) is False
+
+
+# Maps each clause operator to a factory taking ``(field, expected)`` and
+# returning the predicate, so compiling a clause is a single lookup.
+_CLAUSE_COMPILERS: Dict[str, Callable[[Any, Any], RulePredicate]] = {
+    "equals": _compile_equals,
+    "not_equals": _compile_not_equals,
+    "includes": _compile_includes,
+    "not_includes": _compile_not_includes,
+    "any_selected": _compile_any_selected,
+    "all_selected": _compile_all_selected,
+    "contains_any": _compile_contains_any,
+    "is_true": _compile_is_true,
+    "is_false": _compile_is_false,
+}
+
+
+def _compile_clause(clause: Dict[str, Any]) -> RulePredicate:
+    """Return a predicate evaluating ``clause`` with its operator resolved up front."""
+
+    operator = clause.get("operator", "equals")
+    field = clause.get("field")
+
+    if operator == "always":
+        return _always
+
+    if field is None:
+
+        def _missing_field(_answers: Dict[str, Any]) -> bool:
+            st.warning("Rule clause missing 'field'.")
             return False
-        if not isinstance(expected, Sequence) or isinstance(expected, str):
+
+        return _missing_field
+
+    compiler = _CLAUSE_COMPILERS.get(operator) if isinstance(operator, str) else None
+    if compiler is None:
+
+        def _unsupported(_answers: Dict[str, Any]) -> bool:
+            st.warning(f"Unsupported operator: {operator}")
             return False
-        return all(item in value for item in expected)
-    if operator == "is_true":
-        return bool(value) is True
-    if operator == "is_false":
-        return bool(value) is False
 
-    st.warning(f"Unsupported operator: {operator}")
-    return False
+        return _unsupported
+
+    return compiler(field, clause.get("value"))
+
+
+def _compile_rule_tree(rule: Dict[str, Any]) -> RulePredicate:
+    """Compile a rule made of clauses and ``all``/``any`` groups into a predicate."""
+
+    if not rule:
+        return _always
+    if "all" in rule:
+        all_predicates = tuple(_compile_rule_tree(subrule) for subrule in rule.get("all") or [])
+        return lambda answers: all(predicate(answers) for predicate in all_predicates)
+    if "any" in rule:
+        any_predicates = tuple(_compile_rule_tree(subrule) for subrule in rule.get("any") or [])
+        return lambda answers: any(predicate(answers) for predicate in any_predicates)
+    return _compile_clause(rule)
+
+
+@functools.lru_cache(maxsize=256)
+def compile_rule(rule_json: str) -> RulePredicate:
+    """Return a cached predicate for the JSON-serialised ``rule_json``."""
+
+    return _compile_rule_tree(json.loads(rule_json))
+
+
+def _rule_predicate(rule: Dict[str, Any]) -> RulePredicate:
+    """Return the cached compiled predicate for ``rule``."""
+
+    return compile_rule(json.dumps(rule, sort_keys=True))
+
+
+def eval_clause(clause: Dict[str, Any], answers: Dict[str, Any]) -> bool:
+    """Evaluate a single rule clause against the current answers."""
+
+    return _compile_clause(clause)(answers)
 
 
 def eval_rule(rule: Dict[str, Any], answers: Dict[str, Any]) -> bool:
@@ -606,11 +966,7 @@ def eval_rule(rule: Dict[str, Any], answers: Dict[str, Any]) -> bool:
 
     if not rule:
         return True
-    if "all" in rule:
-        return all(eval_rule(subrule, answers) for subrule in rule.get("all", []))
-    if "any" in rule:
-        return any(eval_rule(subrule, answers) for subrule in rule.get("any", []))
-    return eval_clause(rule, answers)
+    return _rule_predicate(rule)(answers)
 
 
 def should_show_question(question: Dict[str, Any], answers: Dict[str, Any]) -> bool:
@@ -619,7 +975,58 @@ def should_show_question(question: Dict[str, Any], answers: Dict[str, Any]) -> b
     show_if = question.get("show_if")
     if not show_if:
         return True
-    return eval_rule(show_if, answers)
+    return _rule_predicate(show_if)(answers)
+
+
+def _rule_fields(rule: Any) -> Iterator[str]:
+    """Yield every answer field referenced by ``rule``."""
+
+    if isinstance(rule, list):
+        for subrule in rule:
+            yield from _rule_fields(subrule)
+    elif isinstance(rule, dict):
+        field = rule.get("field")
+        if isinstance(field, str):
+            yield field
+        yield from _rule_fields(rule.get("all"))
+        yield from _rule_fields(rule.get("any"))
+
+
+def question_dependents(questions: Sequence[Any]) -> Dict[str, Tuple[str, ...]]:
+    """Map each answer field to the keys of the questions whose ``show_if`` reads it."""
+
+    dependents: Dict[str, List[str]] = {}
+    for question in questions:
+        if not isinstance(question, dict):
+            continue
+        question_key = question.get("key")
+        for field in dict.fromkeys(_rule_fields(question.get("show_if"))):
+            dependents.setdefault(field, []).append(question_key)
+    return {field: tuple(keys) for field, keys in dependents.items()}
+
+
+@st.cache_resource(max_entries=32)
+def _question_dependents(
+    digest: str, questionnaire_key: str, _questions: List[Dict[str, Any]]
+) -> Dict[str, Tuple[str, ...]]:
+    """Return :func:`question_dependents` for ``questionnaire_key`` in schema ``digest``."""
+
+    return question_dependents(_questions)
+
+
+def _form_start(questions: Sequence[Dict[str, Any]], dependents: Mapping[str, Any]) -> int:
+    """Return the index of the first question that can be batched in the submit form.
+
+    Questions referenced by another question's ``show_if`` rule must stay
+    outside the form so visibility updates as soon as they are answered. Only
+    the trailing run of questions that gate nothing is placed inside it, which
+    keeps the configured question order intact.
+    """
+
+    start = len(questions)
+    while start and questions[start - 1].get("key") not in dependents:
+        start -= 1
+    return start
 
 
 def _is_required_question(question: Dict[str, Any]) -> bool:
@@ -639,8 +1046,7 @@ def _has_required_answer(question: Dict[str, Any], answers: Dict[str, Any]) -> b
     question_type = question.get("type")
 
     if question_type == "single":
-        options = [option for option in question.get("options", []) if isinstance(option, str)]
-        return isinstance(value, str) and value in options
+        return isinstance(value, str) and value in question.get("options", [])
 
     if question_type == "multiselect":
         return isinstance(value, list) and bool(value)
@@ -657,24 +1063,135 @@ def _has_required_answer(question: Dict[str, Any], answers: Dict[str, Any]) -> b
     return True
 
 
-def collect_missing_required_questions(
-    questionnaire: Dict[str, Any], answers: Dict[str, Any]
-) -> List[str]:
-    """Return labels for required questions without answers."""
+def _required_questions(questions: Sequence[Any]) -> Tuple[Dict[str, Any], ...]:
+    """Return the questions in ``questions`` that enforce a response."""
 
-    missing: List[str] = []
-    for question in questionnaire.get("questions", []) or []:
-        if not isinstance(question, dict):
-            continue
-        if not _is_required_question(question):
-            continue
+    return tuple(
+        question
+        for question in questions or []
+        if isinstance(question, dict) and _is_required_question(question)
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _cached_required_questions(
+    digest: str, questionnaire_key: str, _questions: List[Dict[str, Any]]
+) -> Tuple[Dict[str, Any], ...]:
+    """Return the required questions of ``questionnaire_key`` in schema ``digest``."""
+
+    return _required_questions(_questions)
+
+
+def iter_missing_required_questions(
+    required_questions: Sequence[Dict[str, Any]], answers: Dict[str, Any]
+) -> Iterator[str]:
+    """Yield labels for visible ``required_questions`` without answers."""
+
+    for question in required_questions:
         if not should_show_question(question, answers):
             continue
         if not _has_required_answer(question, answers):
             label = question.get("label")
             key = question.get("key")
-            missing.append(label or key or "Unnamed question")
-    return missing
+            yield label or key or "Unnamed question"
+
+
+def collect_missing_required_questions(
+    questionnaire: Dict[str, Any], answers: Dict[str, Any]
+) -> List[str]:
+    """Return labels for required questions without answers."""
+
+    required_questions = _required_questions(questionnaire.get("questions", []))
+    return list(iter_missing_required_questions(required_questions, answers))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _questionnaire_index(
+    digest: str, _schema: Dict[str, Any]
+) -> Tuple[Dict[str, Dict[str, Any]], Tuple[str, ...], Dict[str, int]]:
+    """Return normalised questionnaires, their keys, and a key-to-position map.
+
+    The result is cached per schema ``digest`` and shared between sessions, so
+    callers must treat the returned questionnaires as read-only.
+    """
+
+    questionnaires = normalize_questionnaires(_schema)
+    keys = tuple(questionnaires.keys())
+    return questionnaires, keys, {key: position for position, key in enumerate(keys)}
+
+
+@dataclass(frozen=True)
+class PageConfig:
+    """Resolved page, introduction and submit settings for a questionnaire."""
+
+    title: str
+    show_introduction: bool
+    intro_heading: str
+    intro_paragraphs: Tuple[str, ...]
+    submit_label: str
+    submit_success: str
+    show_answers_summary: bool
+    show_debug_answers: bool
+    debug_label: str
+
+
+def _settings_text(settings: Dict[str, Any], key: str, default: str) -> str:
+    """Return ``settings[key]`` as text, or ``default`` when the key is absent."""
+
+    if key not in settings:
+        return default
+    return str(settings.get(key) or default)
+
+
+def _settings_flag(settings: Dict[str, Any], key: str, default: bool) -> bool:
+    """Return ``settings[key]`` as a boolean, or ``default`` when it is unset."""
+
+    value = settings.get(key)
+    return default if value is None else bool(value)
+
+
+@st.cache_resource(max_entries=32)
+def _page_config(digest: str, questionnaire_key: str, _questionnaire: Dict[str, Any]) -> PageConfig:
+    """Return the :class:`PageConfig` for ``questionnaire_key`` in schema ``digest``."""
+
+    page_settings = _questionnaire.get("page", {})
+    if not isinstance(page_settings, dict):
+        page_settings = {}
+    introduction_settings = page_settings.get("introduction")
+    if not isinstance(introduction_settings, dict):
+        introduction_settings = {}
+    submit_settings = page_settings.get("submit")
+    if not isinstance(submit_settings, dict):
+        submit_settings = {}
+
+    if "paragraphs" in introduction_settings:
+        paragraphs = _normalise_paragraphs(introduction_settings.get("paragraphs"))
+    else:
+        paragraphs = intro_paragraphs_list()
+
+    return PageConfig(
+        title=str(page_settings.get("title") or "")
+        or _questionnaire.get("label", DEFAULT_PAGE_TITLE)
+        or DEFAULT_PAGE_TITLE,
+        show_introduction=_settings_flag(
+            page_settings, "show_introduction", DEFAULT_SHOW_INTRODUCTION
+        ),
+        intro_heading=(
+            str(introduction_settings.get("heading") or "")
+            if "heading" in introduction_settings
+            else DEFAULT_INTRO_HEADING
+        ),
+        intro_paragraphs=tuple(paragraphs),
+        submit_label=_settings_text(submit_settings, "label", DEFAULT_SUBMIT_LABEL),
+        submit_success=_settings_text(
+            submit_settings, "success_message", DEFAULT_SUBMIT_SUCCESS_MESSAGE
+        ),
+        show_answers_summary=_settings_flag(
+            submit_settings, "show_answers_summary", DEFAULT_SHOW_ANSWERS_SUMMARY
+        ),
+        show_debug_answers=_settings_flag(page_settings, "show_debug_answers", DEFAULT_SHOW_DEBUG),
+        debug_label=_settings_text(page_settings, "debug_expander_label", DEFAULT_DEBUG_LABEL),
+    )
 
 
 def _get_query_param(name: str) -> Optional[str]:
@@ -696,9 +1213,273 @@ def _set_query_param(name: str, value: str) -> None:
     params[name] = value
 
 
+@functools.lru_cache(maxsize=256)
+def _choice_positions(options: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Dict[str, int]]:
+    """Return the widget choices for ``options`` and each choice's first position."""
+
+    choices = (UNSELECTED_LABEL, *options)
+    positions: Dict[str, int] = {}
+    for position, choice in enumerate(choices):
+        positions.setdefault(choice, position)
+    return choices, positions
+
+
+def _reset_widget_if_invalid(widget_key: str, valid_values: Mapping[str, Any]) -> None:
+    """Drop the stored widget value when it is no longer a valid choice."""
+
+    current = st.session_state.get(widget_key)
+    if current is not None and current not in valid_values:
+        st.session_state.pop(widget_key, None)
+
+
+@dataclass(frozen=True, slots=True)
+class RenderItem:
+    """Per-question values that stay fixed for a given schema."""
+
+    question: Dict[str, Any]
+    key: str
+    widget_key: str
+    kind: Optional[str]
+    label: str
+    help_text: Optional[str]
+    default: Any
+    required: bool
+    options: Tuple[str, ...]
+    choices: Tuple[str, ...]
+    choice_positions: Dict[str, int]
+    placeholder: Optional[str]
+    related_record_source: Any
+    show_if: Optional[RulePredicate]
+
+
+def _intern(value: Any) -> Any:
+    """Return ``value`` interned when it is a string, otherwise unchanged."""
+
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _render_item(questionnaire_key: str, question: Dict[str, Any]) -> RenderItem:
+    """Resolve the static render values of ``question``.
+
+    Strings are interned so that repeated labels and option values across
+    questions and schema reloads share a single object.
+    """
+
+    question_key = _intern(question["key"])
+    kind = question.get("type")
+    show_if = question.get("show_if")
+    options = tuple(
+        sys.intern(option) for option in question.get("options") or [] if isinstance(option, str)
+    )
+    choices, choice_positions = _choice_positions(options)
+    return RenderItem(
+        question=question,
+        key=question_key,
+        widget_key=sys.intern(f"{questionnaire_key}_question_{question_key}"),
+        kind=kind,
+        label=_intern(question.get("label", question_key)),
+        help_text=_intern(question.get("help")),
+        default=question.get("default"),
+        required=bool(question.get("required")) and kind != "statement",
+        options=options,
+        choices=choices,
+        choice_positions=choice_positions,
+        placeholder=question.get("placeholder"),
+        related_record_source=question.get("related_record_source"),
+        show_if=_rule_predicate(show_if) if show_if else None,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _render_plan(
+    digest: str, questionnaire_key: str, _questions: List[Dict[str, Any]]
+) -> Tuple[RenderItem, ...]:
+    """Return the :class:`RenderItem` for each question of ``questionnaire_key``."""
+
+    return tuple(_render_item(questionnaire_key, question) for question in _questions)
+
+
+@functools.lru_cache(maxsize=512)
+def _question_header_html(question_intro: str, label: str, help_text: str, required: bool) -> str:
+    """Return the header markup shown above a question widget."""
+
+    return f"""
+        <section class="question-block">
+            <div class="question-block__header">
+                <span class="question-block__step">{question_intro}</span>
+                <h3 class="question-block__title">{label}{'<sup>*</sup>' if required else ''}</h3>
+            </div>
+            {f'<p class="question-block__help">{help_text}</p>' if help_text else ''}
+        </section>
+        """
+
+
+def _render_single(
+    block: Any, item: RenderItem, widget_key: str, answers: Dict[str, Any], default_value: Any
+) -> None:
+    """Render a single-choice question as a radio group."""
+
+    question_key = item.key
+    options = item.options
+    if not options:
+        block.warning(f"Question '{question_key}' has no options configured.")
+        return
+    positions = item.choice_positions
+    _reset_widget_if_invalid(widget_key, positions)
+    current_choice = answers.get(question_key)
+    index = positions.get(current_choice) if isinstance(current_choice, str) else None
+    if not index:
+        index = positions.get(default_value, 0) if isinstance(default_value, str) else 0
+    selection = block.radio(
+        item.label,
+        item.choices,
+        index=index,
+        key=widget_key,
+        label_visibility="collapsed",
+    )
+    if selection == UNSELECTED_LABEL:
+        answers.pop(question_key, None)
+    else:
+        answers[question_key] = selection
+
+
+def _render_multiselect(
+    block: Any, item: RenderItem, widget_key: str, answers: Dict[str, Any], default_value: Any
+) -> None:
+    """Render a multiple-choice question."""
+
+    options = item.options
+    if not options:
+        block.warning(f"Question '{item.key}' has no options configured.")
+        return
+    if isinstance(default_value, list):
+        default_selection = [value for value in default_value if value in options]
+    elif isinstance(item.default, list):
+        default_selection = [value for value in item.default if value in options]
+    else:
+        default_selection = []
+    selections = block.multiselect(
+        item.label,
+        options=options,
+        default=default_selection,
+        key=widget_key,
+        label_visibility="collapsed",
+    )
+    answers[item.key] = selections
+
+
+def _render_bool(
+    block: Any, item: RenderItem, widget_key: str, answers: Dict[str, Any], default_value: Any
+) -> None:
+    """Render a yes/no question as a checkbox."""
+
+    default_bool = bool(default_value) if default_value is not None else False
+    selection = block.checkbox(
+        item.label,
+        value=default_bool,
+        key=widget_key,
+        label_visibility="hidden",
+    )
+    answers[item.key] = selection
+
+
+def _render_text(
+    block: Any, item: RenderItem, widget_key: str, answers: Dict[str, Any], default_value: Any
+) -> None:
+    """Render a free-text question, tracking the record name when applicable."""
+
+    default_text = "" if default_value is None else str(default_value)
+    text_value = block.text_input(
+        item.label,
+        value=default_text,
+        key=widget_key,
+        placeholder=item.placeholder,
+        label_visibility="collapsed",
+    )
+    answers[item.key] = text_value
+    if item.kind == RECORD_NAME_TYPE:
+        stripped = text_value.strip()
+        if stripped:
+            answers[RECORD_NAME_FIELD] = stripped
+        else:
+            answers.pop(RECORD_NAME_FIELD, None)
+
+
+def _render_related_record(
+    block: Any, item: RenderItem, widget_key: str, answers: Dict[str, Any], default_value: Any
+) -> None:
+    """Render a question that links to a previously stored record."""
+
+    question_key = item.key
+    source_key = item.related_record_source
+    if not isinstance(source_key, str) or source_key not in RELATED_RECORD_SOURCES:
+        answers.pop(question_key, None)
+        st.session_state.pop(widget_key, None)
+        block.warning(
+            "Related record questions require a valid source. Contact the questionnaire maintainer."
+        )
+        return
+
+    options = load_related_record_options(source_key)
+    if not options:
+        answers.pop(question_key, None)
+        st.session_state.pop(widget_key, None)
+        block.info(
+            f"No records available for {related_record_source_label(source_key)} yet."
+        )
+        return
+
+    option_values = [value for value, _ in options]
+    labels = {value: label for value, label in options}
+    default_option = default_value if isinstance(default_value, str) else None
+    choices, positions = _choice_positions(tuple(option_values))
+    _reset_widget_if_invalid(widget_key, positions)
+    current_selection = answers.get(question_key)
+    index = positions.get(current_selection) if isinstance(current_selection, str) else None
+    if not index:
+        index = positions.get(default_option, 0) if default_option is not None else 0
+    selection = block.selectbox(
+        item.label,
+        options=list(choices),
+        index=index,
+        key=widget_key,
+        label_visibility="collapsed",
+        format_func=lambda value: labels.get(value, value)
+        if value != UNSELECTED_LABEL
+        else UNSELECTED_LABEL,
+    )
+    if selection == UNSELECTED_LABEL:
+        answers.pop(question_key, None)
+    else:
+        answers[question_key] = selection
+        block.caption(f"Selected record ID: `{selection}`")
+
+
+def _render_statement(
+    block: Any, item: RenderItem, widget_key: str, answers: Dict[str, Any], default_value: Any
+) -> None:
+    """Render an informational statement that takes no response."""
+
+    answers.pop(item.key, None)
+    st.session_state.pop(widget_key, None)
+    block.caption("No response required.")
+
+
+QuestionRenderer = Callable[[Any, RenderItem, str, Dict[str, Any], Any], None]
+
+_QUESTION_RENDERERS: Dict[Optional[str], QuestionRenderer] = {
+    "single": _render_single,
+    "multiselect": _render_multiselect,
+    "bool": _render_bool,
+    "text": _render_text,
+    RECORD_NAME_TYPE: _render_text,
+    "related_record": _render_related_record,
+    "statement": _render_statement,
+}
+
+
 def render_question(
-    questionnaire_key: str,
-    question: Dict[str, Any],
+    item: RenderItem,
     answers: Dict[str, Any],
     *,
     index: int,
@@ -706,20 +1487,19 @@ def render_question(
 ) -> None:
     """Render an individual question widget."""
 
-    question_key = question["key"]
-    widget_key = f"{questionnaire_key}_question_{question_key}"
+    question_key = item.key
+    widget_key = item.widget_key
 
-    if not should_show_question(question, answers):
+    if item.show_if is not None and not item.show_if(answers):
         answers.pop(question_key, None)
-        if widget_key in st.session_state:
-            st.session_state.pop(widget_key)
+        st.session_state.pop(widget_key, None)
         return
 
-    question_type = question.get("type")
-    label = question.get("label", question_key)
-    help_text = question.get("help")
-    default_value = answers.get(question_key, question.get("default"))
-    required = bool(question.get("required")) and question_type != "statement"
+    question_type = item.kind
+    label = item.label
+    help_text = item.help_text
+    default_value = answers.get(question_key, item.default)
+    required = item.required
 
     if question_type == "statement":
         question_intro = "Statement"
@@ -728,188 +1508,147 @@ def render_question(
 
     question_block = st.container()
     question_block.markdown(
-        f"""
-        <section class="question-block">
-            <div class="question-block__header">
-                <span class="question-block__step">{question_intro}</span>
-                <h3 class="question-block__title">{label}{'<sup>*</sup>' if required else ''}</h3>
-            </div>
-            {f'<p class="question-block__help">{help_text}</p>' if help_text else ''}
-        """,
+        _question_header_html(
+            question_intro,
+            str(label),
+            str(help_text) if help_text else "",
+            required,
+        ),
         unsafe_allow_html=True,
     )
 
-    def _close_block() -> None:
-        question_block.markdown("</section>", unsafe_allow_html=True)
+    renderer = _QUESTION_RENDERERS.get(question_type)
+    if renderer is None:
+        question_block.warning(f"Unsupported question type: {question_type}")
+        return
+    renderer(question_block, item, widget_key, answers, default_value)
 
-    if question_type == "single":
-        options: List[str] = [option for option in question.get("options", []) if isinstance(option, str)]
-        if not options:
-            question_block.warning(f"Question '{question_key}' has no options configured.")
-            _close_block()
-            return
-        choices = [UNSELECTED_LABEL, *options]
-        if widget_key in st.session_state and st.session_state[widget_key] not in choices:
-            st.session_state.pop(widget_key)
-        default_choice = answers.get(question_key)
-        if not isinstance(default_choice, str) or default_choice not in options:
-            default_choice = (
-                default_value if isinstance(default_value, str) and default_value in options else UNSELECTED_LABEL
-            )
-        index = choices.index(default_choice)
-        selection = question_block.radio(
-            label,
-            choices,
-            index=index,
-            key=widget_key,
-            label_visibility="collapsed",
-        )
-        if selection == UNSELECTED_LABEL:
-            answers.pop(question_key, None)
-        else:
-            answers[question_key] = selection
-    elif question_type == "multiselect":
-        options = [option for option in question.get("options", []) if isinstance(option, str)]
-        if not options:
-            question_block.warning(f"Question '{question_key}' has no options configured.")
-            _close_block()
-            return
-        if isinstance(default_value, list):
-            default_selection = [value for value in default_value if value in options]
-        elif isinstance(question.get("default"), list):
-            default_selection = [value for value in question.get("default", []) if value in options]
-        else:
-            default_selection = []
-        selections = question_block.multiselect(
-            label,
-            options=options,
-            default=default_selection,
-            key=widget_key,
-            label_visibility="collapsed",
-        )
-        answers[question_key] = selections
-    elif question_type == "bool":
-        default_bool = bool(default_value) if default_value is not None else False
-        selection = question_block.checkbox(
-            label,
-            value=default_bool,
-            key=widget_key,
-            label_visibility="hidden",
-        )
-        answers[question_key] = selection
-    elif question_type in {"text", RECORD_NAME_TYPE}:
-        default_text = "" if default_value is None else str(default_value)
-        text_value = question_block.text_input(
-            label,
-            value=default_text,
-            key=widget_key,
-            placeholder=question.get("placeholder"),
-            label_visibility="collapsed",
+
+@functools.lru_cache(maxsize=32)
+def _render_intro_html(heading: str, paragraphs: Tuple[str, ...]) -> str:
+    """Return the escaped introduction markup for ``heading`` and ``paragraphs``."""
+
+    heading_html = f"<h2>{html_escape(heading)}</h2>" if heading else ""
+    paragraphs_html = "".join(f"<p>{html_escape(paragraph)}</p>" for paragraph in paragraphs)
+    return f'<div class="questionnaire-intro">{heading_html}{paragraphs_html}</div>'
+
+
+@st.fragment
+def _render_questionnaire_body(
+    digest: str,
+    selected_key: str,
+    selected_questionnaire: Dict[str, Any],
+    page_config: PageConfig,
+) -> None:
+    """Render the questions and submit controls of the selected questionnaire.
+
+    This runs as a fragment, so answering a question that gates others reruns
+    only the questionnaire body instead of the whole page.
+    """
+
+    questions = selected_questionnaire.get("questions", [])
+    answers_state: Dict[str, Dict[str, Any]] = st.session_state.setdefault(ANSWERS_STATE_KEY, {})
+    answers = answers_state.setdefault(selected_key, {})
+
+    # Widgets inside the form only trigger a rerun when the questionnaire is
+    # submitted; questions that gate others are rendered live before it.
+    render_plan = _render_plan(digest, selected_key, questions)
+    form_start = _form_start(questions, _question_dependents(digest, selected_key, questions))
+    for idx, item in enumerate(render_plan[:form_start]):
+        render_question(
+            item,
+            answers,
+            index=idx,
+            total=len(questions),
         )
-        answers[question_key] = text_value
-        if question_type == RECORD_NAME_TYPE:
-            stripped = text_value.strip()
-            if stripped:
-                answers[RECORD_NAME_FIELD] = stripped
-            else:
-                answers.pop(RECORD_NAME_FIELD, None)
-    elif question_type == "related_record":
-        source_key = question.get("related_record_source")
-        if not isinstance(source_key, str) or source_key not in RELATED_RECORD_SOURCES:
-            answers.pop(question_key, None)
-            if widget_key in st.session_state:
-                st.session_state.pop(widget_key)
-            question_block.warning(
-                "Related record questions require a valid source. Contact the questionnaire maintainer."
-            )
-            _close_block()
-            return
 
-        options = load_related_record_options(source_key)
-        if not options:
-            answers.pop(question_key, None)
-            if widget_key in st.session_state:
-                st.session_state.pop(widget_key)
-            question_block.info(
-                f"No records available for {related_record_source_label(source_key)} yet."
+    with st.form(key=f"form_{selected_key}", border=False, enter_to_submit=False):
+        for idx in range(form_start, len(questions)):
+            render_question(
+                render_plan[idx],
+                answers,
+                index=idx,
+                total=len(questions),
             )
-            _close_block()
-            return
 
-        option_values = [value for value, _ in options]
-        labels = {value: label for value, label in options}
-        default_option = default_value if isinstance(default_value, str) else None
-        if widget_key in st.session_state and st.session_state[widget_key] not in option_values + [UNSELECTED_LABEL]:
-            st.session_state.pop(widget_key)
-        choices = [UNSELECTED_LABEL, *option_values]
-        current_selection = answers.get(question_key)
-        if isinstance(current_selection, str) and current_selection in option_values:
-            default_option = current_selection
-        elif isinstance(default_option, str) and default_option in option_values:
-            default_option = default_option
-        else:
-            default_option = UNSELECTED_LABEL
-        index = choices.index(default_option)
-        selection = question_block.selectbox(
-            label,
-            options=choices,
-            index=index,
-            key=widget_key,
-            label_visibility="collapsed",
-            format_func=lambda value: labels.get(value, value)
-            if value != UNSELECTED_LABEL
-            else UNSELECTED_LABEL,
-        )
-        if selection == UNSELECTED_LABEL:
-            answers.pop(question_key, None)
-        else:
-            answers[question_key] = selection
-            question_block.caption(f"Selected record ID: `{selection}`")
-    elif question_type == "statement":
-        answers.pop(question_key, None)
-        if widget_key in st.session_state:
-            st.session_state.pop(widget_key)
-        question_block.caption("No response required.")
-    else:
-        question_block.warning(f"Unsupported question type: {question_type}")
+        record_name = extract_record_name(selected_questionnaire, answers)
 
-    _close_block()
+        if page_config.show_debug_answers:
+            with st.expander(page_config.debug_label, expanded=False):
+                st.json(answers)
 
+        submitted = st.form_submit_button(page_config.submit_label, key=f"submit_{selected_key}")
 
-def main() -> None:
-    """Render the questionnaire page."""
+    if submitted:
+        required_questions = _cached_required_questions(digest, selected_key, questions)
+        missing_required = list(iter_missing_required_questions(required_questions, answers))
+        if missing_required:
+            st.error("Please answer all required questions before submitting.")
+            st.markdown("\n".join(f"- {label}" for label in missing_required))
+            return
 
-    apply_app_theme(page_title="Questionnaire runner", page_icon="🗒️")
-    header_placeholder = st.empty()
+        st.success(page_config.submit_success)
+
+        if selected_key == SYSTEM_REGISTRATION_KEY:
+            submission_id = store_system_registration_submission(
+                answers,
+                record_name=record_name,
+            )
+            if submission_id:
+                st.info(f"Submission saved with ID `{submission_id}`.")
+        elif selected_key == ASSESSMENT_KEY:
+            risks = selected_questionnaire.get("risks")
+            submission_id = store_assessment_submission(
+                answers,
+                record_name=record_name,
+                digest=digest,
+                risks=risks if isinstance(risks, list) else [],
+            )
+            if submission_id:
+                st.info(f"Assessment saved with ID `{submission_id}`.")
+
+        if page_config.show_answers_summary:
+            st.json(answers)
 
-    def update_header(title: str, subtitle: str) -> None:
-        page_header(title, subtitle, icon="🗒️", container=header_placeholder)
 
-    update_header(
-        "Questionnaire runner",
-        "Load a questionnaire configuration to start collecting responses.",
-    )
 
-    schema: Dict[str, Any] = {}
-    github_error: Optional[str] = None
+def _load_github_schema() -> Tuple[Dict[str, Any], Optional[str]]:
+    """Return the GitHub schema, or an empty one and the error to show instead."""
+
     try:
-        schema = load_schema_from_github()
+        return load_schema_from_github(), None
     except requests.RequestException:
-        github_error = (
+        return {}, (
             "Unable to load the questionnaire schema from GitHub right now. "
             "Showing the local form definition instead."
         )
     except json.JSONDecodeError:
-        github_error = (
+        return {}, (
             "The schema file on GitHub is not valid JSON. Using the local form definitions "
             "in form_schemas/<form_key>/form_schema.json instead."
         )
-    except Exception:
-        github_error = (
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return {}, (
             "Something went wrong while reading the schema from GitHub. "
             "Falling back to the local form definition."
         )
 
+
+def main() -> None:
+    """Render the questionnaire page."""
+
+    apply_app_theme(page_title="Questionnaire runner", page_icon="🗒️")
+    header_placeholder = st.empty()
+
+    def update_header(title: str, subtitle: str) -> None:
+        page_header(title, subtitle, icon="🗒️", container=header_placeholder)
+
+    update_header(
+        "Questionnaire runner",
+        "Load a questionnaire configuration to start collecting responses.",
+    )
+
+    schema, github_error = _load_github_schema()
     if github_error:
         st.error(github_error)
 
@@ -923,7 +1662,8 @@ def main() -> None:
         st.error("Schema failed to load. Please check form_schemas/<name>/form_schema.json.")
         return
 
-    questionnaires = normalize_questionnaires(schema)
+    digest = schema.get(SCHEMA_DIGEST_KEY) or questionnaire_utils.schema_digest(schema)
+    questionnaires, questionnaire_keys, key_positions = _questionnaire_index(digest, schema)
     if not questionnaires:
         update_header(
             "Questionnaire runner",
@@ -938,10 +1678,9 @@ def main() -> None:
     if not initial_selection or initial_selection not in questionnaires:
         initial_selection = next(iter(questionnaires))
 
-    questionnaire_keys = list(questionnaires.keys())
     selected_key = initial_selection
     if len(questionnaire_keys) > 1:
-        selected_index = questionnaire_keys.index(selected_key)
+        selected_index = key_positions[selected_key]
         selected_key = st.selectbox(
             "Questionnaire",
             options=questionnaire_keys,
@@ -955,10 +1694,7 @@ def main() -> None:
         _set_query_param(QUESTIONNAIRE_QUERY_PARAM, selected_key)
 
     selected_questionnaire = questionnaires[selected_key]
-    page_settings = selected_questionnaire.get("page", {})
-    page_title = str(page_settings.get("title") or "")
-    if not page_title:
-        page_title = selected_questionnaire.get("label", DEFAULT_PAGE_TITLE)
+    page_config = _page_config(digest, selected_key, selected_questionnaire)
     questions = selected_questionnaire.get("questions", [])
     question_count = len(questions) if isinstance(questions, list) else 0
     subtitle = (
@@ -966,120 +1702,18 @@ def main() -> None:
         if question_count
         else "No questions configured yet."
     )
-    update_header(page_title or DEFAULT_PAGE_TITLE, subtitle)
+    update_header(page_config.title, subtitle)
 
-    show_introduction = page_settings.get("show_introduction")
-    if show_introduction is None:
-        show_introduction = DEFAULT_SHOW_INTRODUCTION
-
-    introduction_settings = (
-        page_settings.get("introduction")
-        if isinstance(page_settings.get("introduction"), dict)
-        else {}
-    )
-    heading = (
-        str(introduction_settings.get("heading") or "")
-        if "heading" in introduction_settings
-        else DEFAULT_INTRO_HEADING
-    )
-    if "paragraphs" in introduction_settings:
-        paragraphs = _normalise_paragraphs(introduction_settings.get("paragraphs"))
-    else:
-        paragraphs = intro_paragraphs_list()
-
-    if show_introduction and (heading or paragraphs):
-        intro_parts = ["<div class=\"questionnaire-intro\">"]
-        if heading:
-            intro_parts.append(f"<h2>{html_escape(heading)}</h2>")
-        for paragraph in paragraphs:
-            intro_parts.append(f"<p>{html_escape(paragraph)}</p>")
-        intro_parts.append("</div>")
-        st.markdown("\n".join(intro_parts), unsafe_allow_html=True)
+    heading = page_config.intro_heading
+    paragraphs = page_config.intro_paragraphs
+    if page_config.show_introduction and (heading or paragraphs):
+        st.markdown(_render_intro_html(heading, paragraphs), unsafe_allow_html=True)
 
     if not questions:
         st.info("No questions defined in the schema yet.")
         return
 
-    answers_state: Dict[str, Dict[str, Any]] = st.session_state.setdefault(ANSWERS_STATE_KEY, {})
-    answers = answers_state.setdefault(selected_key, {})
-
-    for idx, question in enumerate(questions):
-        render_question(
-            selected_key,
-            question,
-            answers,
-            index=idx,
-            total=len(questions),
-        )
-
-    answers_state[selected_key] = answers
-    st.session_state[ANSWERS_STATE_KEY] = answers_state
-
-    record_name = extract_record_name(selected_questionnaire, answers)
-
-    submit_settings = (
-        page_settings.get("submit")
-        if isinstance(page_settings.get("submit"), dict)
-        else {}
-    )
-    submit_label = (
-        str(submit_settings.get("label") or DEFAULT_SUBMIT_LABEL)
-        if "label" in submit_settings
-        else DEFAULT_SUBMIT_LABEL
-    )
-    submit_success_message = (
-        str(submit_settings.get("success_message") or DEFAULT_SUBMIT_SUCCESS_MESSAGE)
-        if "success_message" in submit_settings
-        else DEFAULT_SUBMIT_SUCCESS_MESSAGE
-    )
-    show_answers_summary = submit_settings.get("show_answers_summary")
-    if show_answers_summary is None:
-        show_answers_summary = DEFAULT_SHOW_ANSWERS_SUMMARY
-    else:
-        show_answers_summary = bool(show_answers_summary)
-
-    show_debug_answers = page_settings.get("show_debug_answers")
-    if show_debug_answers is None:
-        show_debug_answers = DEFAULT_SHOW_DEBUG
-    else:
-        show_debug_answers = bool(show_debug_answers)
-
-    if show_debug_answers:
-        debug_label = (
-            str(page_settings.get("debug_expander_label") or DEFAULT_DEBUG_LABEL)
-            if "debug_expander_label" in page_settings
-            else DEFAULT_DEBUG_LABEL
-        )
-        with st.expander(debug_label, expanded=False):
-            st.json(answers)
-
-    if st.button(submit_label, key=f"submit_{selected_key}"):
-        missing_required = collect_missing_required_questions(selected_questionnaire, answers)
-        if missing_required:
-            st.error("Please answer all required questions before submitting.")
-            st.markdown("\n".join(f"- {label}" for label in missing_required))
-            return
-
-        st.success(submit_success_message)
-
-        if selected_key == SYSTEM_REGISTRATION_KEY:
-            submission_id = store_system_registration_submission(
-                answers,
-                record_name=record_name,
-            )
-            if submission_id:
-                st.info(f"Submission saved with ID `{submission_id}`.")
-        elif selected_key == ASSESSMENT_KEY:
-            submission_id = store_assessment_submission(
-                answers,
-                record_name=record_name,
-            )
-            if submission_id:
-                st.info(f"Assessment saved with ID `{submission_id}`.")
-
-        if show_answers_summary:
-            st.json(answers)
-
+    _render_questionnaire_body(digest, selected_key, selected_questionnaire, page_config)
 
 if __name__ == "__main__":
     main()
@@ -2,25 +2,32 @@
 
 from __future__ import annotations
 
+import functools
 import hashlib
 import hmac
 import json
+import os
 import sys
 from contextlib import contextmanager
 from copy import deepcopy
 from datetime import datetime
 from pathlib import Path
 from collections.abc import Mapping
-from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 import streamlit as st
 
+try:  # pragma: no cover - optional faster JSON encoder/decoder
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from Home import load_schema
-from lib.github_backend import GitHubBackend, create_branch, ensure_pr, put_file
 from lib.form_store import load_combined_schema, local_form_path, resolve_remote_form_path
 import lib.questionnaire_utils as questionnaire_utils
 from lib.ui_theme import apply_app_theme, page_header
@@ -50,6 +57,9 @@ from lib.schema_defaults import (
     intro_paragraphs_list,
 )
 
+if TYPE_CHECKING:  # pragma: no cover - imported lazily to keep ``requests`` off cold starts
+    from lib.github_backend import GitHubBackend
+
 SCHEMA_STATE_KEY = "editor_schema"
 SCHEMA_SHA_STATE_KEY = "editor_schema_sha"
 DRAFT_BRANCH_STATE_KEY = "editor_draft_branch"
@@ -57,7 +67,9 @@ FORM_SOURCES_STATE_KEY = "editor_form_sources"
 FORM_RAW_STATE_KEY = "editor_form_raw"
 ACTIVE_QUESTION_STATE_KEY = "editor_active_question"
 ACTIVE_RISK_STATE_KEY = "editor_active_risk"
-QUESTION_TYPES = [
+# Rule keys holding nested clauses; keep in sync with .github/workflows/validate-schema.yml.
+RULE_GROUP_KEYS: Tuple[str, ...] = ("all", "any", "none")
+QUESTION_TYPES: Tuple[str, ...] = (
     "single",
     "multiselect",
     "bool",
@@ -65,7 +77,7 @@ QUESTION_TYPES = [
     RECORD_NAME_TYPE,
     "statement",
     "related_record",
-]
+)
 QUESTION_TYPE_LABELS = {
     "single": "Single select",
     "multiselect": "Multi select",
@@ -136,6 +148,24 @@ def _is_clause_rule(value: Any) -> bool:
     return isinstance(value, dict) and "operator" in value and "all" not in value and "any" not in value
 
 
+def _copy_clause(clause: Dict[str, Any]) -> Dict[str, Any]:
+    """Return an independent copy of a rule clause.
+
+    Clauses hold strings, booleans and lists of strings, so copying the dict
+    and its list values is enough; nested dicts still go through
+    ``deepcopy``.
+    """
+
+    copied: Dict[str, Any] = {}
+    for key, value in clause.items():
+        if isinstance(value, list):
+            value = [deepcopy(item) if isinstance(item, (dict, list)) else item for item in value]
+        elif isinstance(value, dict):
+            value = deepcopy(value)
+        copied[key] = value
+    return copied
+
+
 def _normalize_groups(groups: List[Dict[str, Any]]) -> None:
     """Ensure rule group metadata is internally consistent."""
 
@@ -192,7 +222,7 @@ def _group_to_rule(group: Dict[str, Any]) -> Dict[str, Any]:
     """Convert a builder group into a schema-compatible rule segment."""
 
     mode = group.get("mode", "all")
-    clauses = [deepcopy(clause) for clause in group.get("clauses", []) if clause]
+    clauses = [_copy_clause(clause) for clause in group.get("clauses", []) if clause]
     if not clauses:
         return {}
     if mode not in {"all", "any"}:
@@ -229,18 +259,25 @@ def _groups_to_rule(
 
 
 def iter_rule_fields(rule: Any) -> List[str]:
-    """Return all question keys referenced by ``rule``."""
+    """Return all question keys referenced by ``rule``, in document order."""
 
     fields: List[str] = []
-    if isinstance(rule, dict):
-        field_value = rule.get("field")
-        if isinstance(field_value, str):
-            fields.append(field_value)
-        for value in rule.values():
-            fields.extend(iter_rule_fields(value))
-    elif isinstance(rule, list):
-        for item in rule:
-            fields.extend(iter_rule_fields(item))
+    stack: List[Any] = [rule]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            # Push in reverse so nodes are popped in their original order.
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            field_value = node.get("field")
+            if isinstance(field_value, str):
+                fields.append(field_value)
+            # Only rule buckets can hold further clauses; clause values are data.
+            # Push in reverse so buckets are walked in ``RULE_GROUP_KEYS`` order.
+            for bucket in reversed(RULE_GROUP_KEYS):
+                children = node.get(bucket)
+                if isinstance(children, list):
+                    stack.append(children)
     return fields
 
 
@@ -254,7 +291,7 @@ def _rule_to_groups(rule: Dict[str, Any]) -> Optional[Dict[str, Any]]:
 
     def _extract_group(node: Any) -> Optional[Dict[str, Any]]:
         if _is_clause_rule(node):
-            return {"mode": "all", "clauses": [deepcopy(node)]}
+            return {"mode": "all", "clauses": [_copy_clause(node)]}
 
         if not isinstance(node, dict):
             return None
@@ -275,7 +312,7 @@ def _rule_to_groups(rule: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         if all(_is_clause_rule(item) for item in items):
             return {
                 "mode": key,
-                "clauses": [deepcopy(item) for item in items],
+                "clauses": [_copy_clause(item) for item in items],
             }
 
         if len(items) == 1:
@@ -377,19 +414,30 @@ DEFAULT_OPERATORS = ["equals", "not_equals", "contains_any"]
 PREVIEW_ANSWERS_STATE_KEY = "editor_preview_answers"
 
 
-def _secrets_dict(name: str) -> Dict[str, Any]:
-    """Return a mapping stored under ``name`` in Streamlit secrets."""
+def _secrets_dict(name: str, secrets: Optional[Mapping[str, Any]] = None) -> Dict[str, Any]:
+    """Return a mapping stored under ``name`` in Streamlit secrets.
+
+    ``secrets`` may be a snapshot taken with ``dict(st.secrets)`` so repeated
+    lookups avoid the secrets proxy.
+    """
 
-    value = st.secrets.get(name, {})  # type: ignore[arg-type]
+    source = st.secrets if secrets is None else secrets
+    value = source.get(name, {})  # type: ignore[arg-type]
     if isinstance(value, Mapping):
         return dict(value)
     return {}
 
 
-def get_github_config() -> Optional[Dict[str, Any]]:
-    """Return GitHub configuration from Streamlit secrets if available."""
+@st.cache_resource(show_spinner=False)
+def get_github_config() -> Optional[Mapping[str, Any]]:
+    """Return GitHub configuration from Streamlit secrets if available.
 
-    secrets = _secrets_dict("github")
+    Secrets are static for the lifetime of the server process, so the result is
+    resolved once and shared read-only between sessions and reruns.
+    """
+
+    snapshot = dict(st.secrets)
+    secrets = _secrets_dict("github", snapshot)
     token = secrets.get("token")
     repo = secrets.get("repo")
     path = secrets.get("path", "form_schemas/{form_key}/form_schema.json")
@@ -397,35 +445,44 @@ def get_github_config() -> Optional[Dict[str, Any]]:
     api_url = secrets.get("api_url", "https://api.github.com")
 
     if not (token and repo and path):
-        token = st.secrets.get("github_token", token)
-        repo = st.secrets.get("github_repo", repo)
-        path = st.secrets.get("github_file_path", path)
-        branch = st.secrets.get("github_branch", branch)
-        api_url = st.secrets.get("github_api_url", api_url)
+        token = snapshot.get("github_token", token)
+        repo = snapshot.get("github_repo", repo)
+        path = snapshot.get("github_file_path", path)
+        branch = snapshot.get("github_branch", branch)
+        api_url = snapshot.get("github_api_url", api_url)
 
     if token and repo and path:
-        return {
-            "token": token,
-            "repo": repo,
-            "path": path,
-            "branch": branch,
-            "api_url": api_url,
-        }
+        return MappingProxyType(
+            {
+                "token": token,
+                "repo": repo,
+                "path": path,
+                "branch": branch,
+                "api_url": api_url,
+            }
+        )
     return None
 
 
-def get_backend(form_key: str) -> Optional[GitHubBackend]:
-    """Instantiate a GitHub backend for ``form_key`` if configuration is available."""
+@st.cache_resource(show_spinner=False, max_entries=16)
+def get_backend(form_key: str, branch: Optional[str] = None) -> Optional[GitHubBackend]:
+    """Return a shared GitHub backend for ``form_key`` if configuration is available.
+
+    ``branch`` defaults to the configured branch; draft saves pass their draft
+    branch instead.
+    """
 
     config = get_github_config()
     if config is None:
         return None
 
+    from lib.github_backend import GitHubBackend
+
     return GitHubBackend(
         token=config["token"],
         repo=config["repo"],
         path=resolve_remote_form_path(config["path"], form_key),
-        branch=config.get("branch", "main"),
+        branch=branch or config.get("branch", "main"),
         api_url=config.get("api_url", "https://api.github.com"),
     )
 
@@ -524,15 +581,24 @@ def schema_for_storage(schema: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Dic
     return active_id, base_payload, questionnaire_copy
 
 
-def verify_password(password: str) -> bool:
-    """Validate a plaintext password against the configured hash."""
+def verify_password(password: str, stored_hash: Optional[str] = None) -> bool:
+    """Validate a plaintext password against the configured hash.
 
-    stored_hash = st.secrets.get("editor_password_hash", "")
+    ``stored_hash`` defaults to ``editor_password_hash`` from Streamlit secrets.
+    """
+
+    if stored_hash is None:
+        stored_hash = st.secrets.get("editor_password_hash", "")
     if not stored_hash:
         return False
 
-    digest = hashlib.sha256(password.encode("utf-8")).hexdigest()
-    return hmac.compare_digest(digest, stored_hash)
+    try:
+        expected = bytes.fromhex(stored_hash)
+    except (TypeError, ValueError):
+        return False
+
+    digest = hashlib.sha256(password.encode("utf-8")).digest()
+    return hmac.compare_digest(digest, expected)
 
 
 def require_authentication() -> None:
@@ -550,7 +616,7 @@ def require_authentication() -> None:
     if not password:
         st.stop()
 
-    if verify_password(password):
+    if verify_password(password, stored_hash):
         st.session_state.auth = True
         return
 
@@ -558,13 +624,25 @@ def require_authentication() -> None:
     st.stop()
 
 
+def _show_if_text(rule: Any) -> str:
+    """Return ``rule`` as the indented JSON shown in the show_if text area."""
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(rule, option=orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(rule, indent=2, ensure_ascii=False)
+
+
 def parse_show_if(raw: str) -> Optional[Dict[str, Any]]:
     """Parse the JSON show_if structure provided by the user."""
 
     if not raw.strip():
         return None
     try:
-        return json.loads(raw)
+        # ``orjson.JSONDecodeError`` subclasses the stdlib error.
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
     except json.JSONDecodeError as error:
         st.error(f"Invalid show_if JSON: {error.msg}")
         return None
@@ -1787,7 +1865,7 @@ def sync_show_if_builder_state(schema: Dict[str, Any]) -> Dict[str, Dict[str, An
         {},
     )
     builder_state = all_states.setdefault(questionnaire_id, {})
-    valid_keys = set()
+    valid_keys: Set[str] = set()
     for question in schema.get("questions", []):
         key = question.get("key")
         if not key:
@@ -1800,14 +1878,16 @@ def sync_show_if_builder_state(schema: Dict[str, Any]) -> Dict[str, Dict[str, An
         parsed_state = _rule_to_groups(show_if) if show_if else {"groups": [], "combine_mode": "all"}
         unsupported = bool(show_if) and parsed_state is None
 
+        # ``_rule_to_groups`` builds fresh groups with copied clauses, and the
+        # previous state entry is replaced below, so neither needs copying.
         if unsupported:
-            groups = deepcopy(existing_state.get("groups", []))
+            groups = existing_state.get("groups", [])
             combine_mode = existing_state.get("combine_mode", "all")
         else:
             groups = (
-                deepcopy(parsed_state["groups"])
+                parsed_state["groups"]
                 if parsed_state is not None
-                else deepcopy(existing_state.get("groups", []))
+                else existing_state.get("groups", [])
             )
             combine_mode = (
                 parsed_state.get("combine_mode", "all")
@@ -1834,9 +1914,8 @@ def sync_show_if_builder_state(schema: Dict[str, Any]) -> Dict[str, Dict[str, An
             "unsupported": unsupported,
         }
 
-    for key in list(builder_state.keys()):
-        if key not in valid_keys:
-            builder_state.pop(key)
+    for key in builder_state.keys() - valid_keys:
+        builder_state.pop(key)
 
     all_states[questionnaire_id] = builder_state
     st.session_state[SHOW_IF_BUILDER_STATE_KEY] = all_states
@@ -1852,7 +1931,7 @@ def sync_risk_builder_state(schema: Dict[str, Any]) -> Dict[str, Dict[str, Any]]
         {},
     )
     builder_state = all_states.setdefault(questionnaire_id, {})
-    valid_keys = set()
+    valid_keys: Set[str] = set()
     risks = schema.get("risks", []) if isinstance(schema.get("risks"), list) else []
 
     for risk in risks:
@@ -1868,13 +1947,13 @@ def sync_risk_builder_state(schema: Dict[str, Any]) -> Dict[str, Dict[str, Any]]
         unsupported = bool(logic) and parsed_state is None
 
         if unsupported:
-            groups = deepcopy(existing_state.get("groups", []))
+            groups = existing_state.get("groups", [])
             combine_mode = existing_state.get("combine_mode", "all")
         else:
             groups = (
-                deepcopy(parsed_state["groups"])
+                parsed_state["groups"]
                 if parsed_state is not None
-                else deepcopy(existing_state.get("groups", []))
+                else existing_state.get("groups", [])
             )
             combine_mode = (
                 parsed_state.get("combine_mode", "all")
@@ -1901,9 +1980,8 @@ def sync_risk_builder_state(schema: Dict[str, Any]) -> Dict[str, Dict[str, Any]]
             "unsupported": unsupported,
         }
 
-    for key in list(builder_state.keys()):
-        if key not in valid_keys:
-            builder_state.pop(key)
+    for key in builder_state.keys() - valid_keys:
+        builder_state.pop(key)
 
     all_states[questionnaire_id] = builder_state
     st.session_state[RISK_BUILDER_STATE_KEY] = all_states
@@ -2237,16 +2315,16 @@ def render_show_if_builder(
             target_question.pop("show_if", None)
 
         if target_question.get("show_if"):
-            st.session_state[json_override_key] = json.dumps(
-                target_question["show_if"],
-                indent=2,
-            )
+            st.session_state[json_override_key] = _show_if_text(target_question["show_if"])
         else:
             st.session_state[json_override_key] = ""
 
         st.session_state[SCHEMA_STATE_KEY] = schema
 
-    _sync_question_rule()
+    # The groups were just rebuilt from the stored rule, so the schema and the
+    # JSON editor only need rewriting when that round trip normalises the rule.
+    if _groups_to_rule(groups, combine_mode) != (target_question.get("show_if") or {}):
+        _sync_question_rule()
 
     group_selector_key = f"show_if_active_group_{prefix}_{question_key}"
     pending_selector_key = f"show_if_pending_active_group_{prefix}_{question_key}"
@@ -2699,102 +2777,109 @@ def render_show_if_builder(
     value: Any = None
     value_valid = True
 
-    if value_mode == "single":
-        value_options: List[str] = []
-        if referenced_question:
-            reference_options = referenced_question.get("options")
-            if isinstance(reference_options, list):
-                value_options = [str(option) for option in reference_options if isinstance(option, str)]
-
-        if value_options:
-            value_single_key = f"show_if_value_single_{question_key}_{selected_group_index}"
-            if value_single_key not in st.session_state:
-                st.session_state[value_single_key] = value_options[0]
-            if st.session_state[value_single_key] not in value_options:
-                st.session_state[value_single_key] = value_options[0]
-            value = st.selectbox(
-                "Comparison value",
-                options=value_options,
-                index=value_options.index(st.session_state[value_single_key]),
-                key=value_single_key,
-                help="Pick the answer that should satisfy this new clause.",
-            )
-        else:
-            value = st.text_input(
-                "Comparison value",
-                key=f"show_if_value_text_{question_key}_{selected_group_index}",
-                placeholder="Enter a value to compare against",
-            )
-            value_valid = bool(str(value).strip())
-            if not value_valid:
-                st.info("Provide a value to compare against.")
-    elif value_mode == "multi":
-        value_options = []
-        if referenced_question:
-            reference_options = referenced_question.get("options")
-            if isinstance(reference_options, list):
-                value_options = [str(option) for option in reference_options if isinstance(option, str)]
-
-        if value_options:
-            value_multi_key = f"show_if_value_multi_{question_key}_{selected_group_index}"
-            if value_multi_key not in st.session_state:
-                st.session_state[value_multi_key] = []
-            if st.session_state[value_multi_key]:
-                st.session_state[value_multi_key] = [
-                    option for option in st.session_state[value_multi_key] if option in value_options
-                ]
-            value = st.multiselect(
-                "Matching values",
-                options=value_options,
-                default=st.session_state[value_multi_key],
-                key=value_multi_key,
-                help="Choose one or more answers that should satisfy this clause.",
-            )
-            value_valid = bool(value)
-            if not value_valid:
-                st.info("Select at least one value to compare against.")
-        else:
-            value_rows_key = f"show_if_value_rows_{question_key}_{selected_group_index}"
-            existing_rows = st.session_state.get(value_rows_key)
-            if existing_rows is None:
-                default_rows: Sequence[Any] = [{"Value": ""}]
+    value_form = st.form(
+        f"show_if_add_clause_form_{prefix}_{question_key}_{selected_group_index}",
+        border=False,
+    )
+    with value_form:
+        if value_mode == "single":
+            value_options: List[str] = []
+            if referenced_question:
+                reference_options = referenced_question.get("options")
+                if isinstance(reference_options, list):
+                    value_options = [str(option) for option in reference_options if isinstance(option, str)]
+
+            if value_options:
+                value_single_key = f"show_if_value_single_{question_key}_{selected_group_index}"
+                if value_single_key not in st.session_state:
+                    st.session_state[value_single_key] = value_options[0]
+                if st.session_state[value_single_key] not in value_options:
+                    st.session_state[value_single_key] = value_options[0]
+                value = st.selectbox(
+                    "Comparison value",
+                    options=value_options,
+                    index=value_options.index(st.session_state[value_single_key]),
+                    key=value_single_key,
+                    help="Pick the answer that should satisfy this new clause.",
+                )
             else:
-                default_rows = existing_rows
-            value_rows = st.data_editor(
-                default_rows,
-                num_rows="dynamic",
-                hide_index=True,
-                key=value_rows_key,
-                use_container_width=True,
-            )
-
-            rows_iterable: Sequence[Any]
-            if hasattr(value_rows, "to_dict"):
-                rows_iterable = value_rows.to_dict(orient="records")  # type: ignore[call-arg]
-            elif isinstance(value_rows, list):
-                rows_iterable = value_rows
+                value = st.text_input(
+                    "Comparison value",
+                    key=f"show_if_value_text_{question_key}_{selected_group_index}",
+                    placeholder="Enter a value to compare against",
+                )
+                value_valid = bool(str(value).strip())
+                if not value_valid:
+                    st.info("Provide a value to compare against.")
+        elif value_mode == "multi":
+            value_options = []
+            if referenced_question:
+                reference_options = referenced_question.get("options")
+                if isinstance(reference_options, list):
+                    value_options = [str(option) for option in reference_options if isinstance(option, str)]
+
+            if value_options:
+                value_multi_key = f"show_if_value_multi_{question_key}_{selected_group_index}"
+                if value_multi_key not in st.session_state:
+                    st.session_state[value_multi_key] = []
+                if st.session_state[value_multi_key]:
+                    st.session_state[value_multi_key] = [
+                        option for option in st.session_state[value_multi_key] if option in value_options
+                    ]
+                value = st.multiselect(
+                    "Matching values",
+                    options=value_options,
+                    default=st.session_state[value_multi_key],
+                    key=value_multi_key,
+                    help="Choose one or more answers that should satisfy this clause.",
+                )
+                value_valid = bool(value)
+                if not value_valid:
+                    st.info("Select at least one value to compare against.")
             else:
-                rows_iterable = []
+                value_rows_key = f"show_if_value_rows_{question_key}_{selected_group_index}"
+                existing_rows = st.session_state.get(value_rows_key)
+                if existing_rows is None:
+                    default_rows: Sequence[Any] = [{"Value": ""}]
+                else:
+                    default_rows = existing_rows
+                value_rows = st.data_editor(
+                    default_rows,
+                    num_rows="dynamic",
+                    hide_index=True,
+                    key=value_rows_key,
+                    use_container_width=True,
+                )
 
-            extracted: List[str] = []
-            for row in rows_iterable:
-                if isinstance(row, dict):
-                    raw_value = str(row.get("Value", "")).strip()
+                rows_iterable: Sequence[Any]
+                if hasattr(value_rows, "to_dict"):
+                    rows_iterable = value_rows.to_dict(orient="records")  # type: ignore[call-arg]
+                elif isinstance(value_rows, list):
+                    rows_iterable = value_rows
                 else:
-                    raw_value = str(row).strip()
-                if raw_value:
-                    extracted.append(raw_value)
+                    rows_iterable = []
 
-            value = extracted
-            value_valid = bool(extracted)
-            if not extracted:
-                st.info("Add at least one value for this clause.")
+                extracted: List[str] = []
+                for row in rows_iterable:
+                    if isinstance(row, dict):
+                        raw_value = str(row.get("Value", "")).strip()
+                    else:
+                        raw_value = str(row).strip()
+                    if raw_value:
+                        extracted.append(raw_value)
+
+                value = extracted
+                value_valid = bool(extracted)
+                if not extracted:
+                    st.info("Add at least one value for this clause.")
+
+        submitted = value_form.form_submit_button(
+            "Add condition",
+            key=f"show_if_add_clause_{prefix}_{question_key}_{selected_group_index}",
+            help="Append this new condition to the selected group.",
+        )
 
-    if st.button(
-        "Add condition",
-        key=f"show_if_add_clause_{prefix}_{question_key}_{selected_group_index}",
-        help="Append this new condition to the selected group.",
-    ):
+    if submitted:
         if selected_operator != "always" and not clause_field_key:
             st.error("Select a question to reference for this clause.")
         elif value_mode == "single" and not value_valid:
@@ -2840,81 +2925,152 @@ def render_show_if_builder(
         st.info("No show_if rule configured for this question.")
 
 
-def eval_clause(clause: Dict[str, Any], answers: Dict[str, Any]) -> bool:
-    """Evaluate a single rule clause against preview answers."""
+# Concrete types only: ``isinstance`` against the ``Sequence`` ABC is much slower
+# and answers/rule values are always JSON lists (or tuples) anyway.
+_LIST_TYPES = (list, tuple)
 
-    operator = clause.get("operator", "equals")
-    field = clause.get("field")
-    expected = clause.get("value")
 
-    if field is None and operator != "always":
-        st.warning("Rule clause missing 'field'.")
+def _op_includes(value: Any, expected: Any) -> bool:
+    if value is None:
         return False
+    if isinstance(value, (list, tuple, set)):
+        return expected in value
+    return value == expected
 
-    value = answers.get(field)
 
-    if operator == "always":
+def _op_not_includes(value: Any, expected: Any) -> bool:
+    if value is None:
         return True
-    if operator == "equals":
-        return value == expected
-    if operator == "not_equals":
-        return value != expected
-    if operator == "includes":
-        if value is None:
-            return False
-        if isinstance(value, (list, tuple, set)):
-            return expected in value
-        return value == expected
-    if operator == "not_includes":
-        if value is None:
-            return True
-        if isinstance(value, (list, tuple, set)):
-            return expected not in value
-        return value != expected
-    if operator == "any_selected":
-        if not isinstance(value, Sequence) or isinstance(value, str):
-            return False
-        if not isinstance(expected, Sequence) or isinstance(expected, str):
-            return False
-        return any(item in value for item in expected)
-    if operator == "contains_any":
-        if expected is None:
-            return False
-        if isinstance(expected, Sequence) and not isinstance(expected, str):
-            expected_values = list(expected)
-        else:
-            expected_values = [expected]
+    if isinstance(value, (list, tuple, set)):
+        return expected not in value
+    return value != expected
 
-        if isinstance(value, str):
-            return any(isinstance(item, str) and item in value for item in expected_values)
-        if isinstance(value, Sequence) and not isinstance(value, str):
-            return any(item in value for item in expected_values)
+
+def _op_any_selected(value: Any, expected: Any) -> bool:
+    if not isinstance(value, _LIST_TYPES) or not isinstance(expected, _LIST_TYPES):
         return False
-    if operator == "all_selected":
-        if not isinstance(value, Sequence) or isinstance(value, str):
-            return False
-        if not isinstance(expected, Sequence) or isinstance(expected, str):
-            return False
-        return all(item in value for item in expected)
-    if operator == "is_true":
-        return bool(value) is True
-    if operator == "is_false":
-        return bool(value) is False
+    return any(item in value for item in expected)
+
+
+def _op_all_selected(value: Any, expected: Any) -> bool:
+    if not isinstance(value, _LIST_TYPES) or not isinstance(expected, _LIST_TYPES):
+        return False
+    return all(item in value for item in expected)
+
+
+def _op_contains_any(value: Any, expected: Any) -> bool:
+    if expected is None:
+        return False
+    expected_values = expected if isinstance(expected, _LIST_TYPES) else (expected,)
 
-    st.warning(f"Unsupported operator: {operator}")
+    if isinstance(value, str):
+        return any(isinstance(item, str) and item in value for item in expected_values)
+    if isinstance(value, _LIST_TYPES):
+        return any(item in value for item in expected_values)
     return False
 
 
+# Operator name -> ``(answer, expected) -> bool``; ``always`` is handled inline.
+_OP_HANDLERS: Dict[str, Callable[[Any, Any], bool]] = {
+    "equals": lambda value, expected: value == expected,
+    "not_equals": lambda value, expected: value != expected,
+    "includes": _op_includes,
+    "not_includes": _op_not_includes,
+    "any_selected": _op_any_selected,
+    "contains_any": _op_contains_any,
+    "all_selected": _op_all_selected,
+    "is_true": lambda value, _expected: bool(value) is True,
+    "is_false": lambda value, _expected: bool(value) is False,
+}
+
+
+def eval_clause(clause: Dict[str, Any], answers: Dict[str, Any]) -> bool:
+    """Evaluate a single rule clause against preview answers."""
+
+    return _compile_clause(clause)(answers)
+
+
 def eval_rule(rule: Dict[str, Any], answers: Dict[str, Any]) -> bool:
     """Evaluate a composite rule against preview answers."""
 
+    return _compile_rule(rule)(answers)
+
+
+RulePredicate = Callable[[Mapping[str, Any]], bool]
+
+
+def _always(_answers: Mapping[str, Any]) -> bool:
+    return True
+
+
+def _never(_answers: Mapping[str, Any]) -> bool:
+    return False
+
+
+def _compile_clause(clause: Dict[str, Any]) -> RulePredicate:
+    """Return a predicate equivalent to ``eval_clause`` for ``clause``."""
+
+    operator = clause.get("operator", "equals")
+    field = clause.get("field")
+    expected = clause.get("value")
+
+    if operator == "always":
+        return _always
+    if field is None:
+
+        def missing_field(_answers: Mapping[str, Any]) -> bool:
+            st.warning("Rule clause missing 'field'.")
+            return False
+
+        return missing_field
+
+    handler = _OP_HANDLERS.get(operator) if isinstance(operator, str) else None
+    if handler is None:
+
+        def unsupported(_answers: Mapping[str, Any]) -> bool:
+            st.warning(f"Unsupported operator: {operator}")
+            return False
+
+        return unsupported
+
+    return lambda answers: handler(answers.get(field), expected)
+
+
+def _compile_rule(rule: Dict[str, Any]) -> RulePredicate:
+    """Return a predicate equivalent to ``eval_rule`` for ``rule``."""
+
     if not rule:
-        return True
-    if "all" in rule:
-        return all(eval_rule(subrule, answers) for subrule in rule.get("all", []))
-    if "any" in rule:
-        return any(eval_rule(subrule, answers) for subrule in rule.get("any", []))
-    return eval_clause(rule, answers)
+        return _always
+    for mode in ("all", "any"):
+        if mode not in rule:
+            continue
+        predicates = tuple(_compile_rule(subrule) for subrule in rule.get(mode) or ())
+        # Builder rules are mostly single-clause groups; skip the wrapper.
+        if len(predicates) == 1:
+            return predicates[0]
+        if not predicates:
+            return _always if mode == "all" else _never
+        if mode == "all":
+            return lambda answers: all(predicate(answers) for predicate in predicates)
+        return lambda answers: any(predicate(answers) for predicate in predicates)
+    return _compile_clause(rule)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_rule_json(rule_json: str) -> RulePredicate:
+    """Return a cached predicate for the JSON-serialised ``rule_json``."""
+
+    return _compile_rule(json.loads(rule_json))
+
+
+def _rule_predicate(rule: Dict[str, Any]) -> RulePredicate:
+    """Return the compiled predicate for ``rule``, reusing it across reruns.
+
+    The canonical JSON form is the cache key, so rules edited in place by the
+    builder compile afresh while unchanged ones reuse their predicate.
+    """
+
+    return _compile_rule_json(json.dumps(rule, sort_keys=True))
 
 
 def should_show_question(question: Dict[str, Any], answers: Dict[str, Any]) -> bool:
@@ -2923,7 +3079,7 @@ def should_show_question(question: Dict[str, Any], answers: Dict[str, Any]) -> b
     show_if = question.get("show_if")
     if not show_if:
         return True
-    return eval_rule(show_if, answers)
+    return _rule_predicate(show_if)(answers)
 
 
 def render_preview_question(
@@ -2962,11 +3118,10 @@ def render_preview_question(
         )
         if not isinstance(default_choice, str) or default_choice not in options:
             default_choice = UNSELECTED_LABEL
-        index = choices.index(default_choice)
+        st.session_state.setdefault(widget_key, default_choice)
         selection = st.radio(
             display_label,
             choices,
-            index=index,
             key=widget_key,
             help=help_text,
         )
@@ -2982,28 +3137,33 @@ def render_preview_question(
             default_selection = [value for value in question.get("default", []) if value in options]
         else:
             default_selection = []
+        current = st.session_state.get(widget_key)
+        if current is None:
+            st.session_state[widget_key] = default_selection
+        elif any(value not in options for value in current):
+            # Keep the selections whose options still exist.
+            st.session_state[widget_key] = [value for value in current if value in options]
         selections = st.multiselect(
             display_label,
             options=options,
-            default=default_selection,
             key=widget_key,
             help=help_text,
         )
         answers[question_key] = selections
     elif question_type == "bool":
         default_bool = bool(default_value) if default_value is not None else False
+        st.session_state.setdefault(widget_key, default_bool)
         selection = st.checkbox(
             display_label,
-            value=default_bool,
             key=widget_key,
             help=help_text,
         )
         answers[question_key] = selection
     elif question_type in {"text", RECORD_NAME_TYPE}:
         default_text = "" if default_value is None else str(default_value)
+        st.session_state.setdefault(widget_key, default_text)
         text_value = st.text_input(
             display_label,
-            value=default_text,
             key=widget_key,
             placeholder=question.get("placeholder"),
             help=help_text,
@@ -3048,11 +3208,10 @@ def render_preview_question(
         if isinstance(current_selection, str) and current_selection in option_values:
             default_option = current_selection
         default_option = default_option if isinstance(default_option, str) else UNSELECTED_LABEL
-        index = choices.index(default_option)
+        st.session_state.setdefault(widget_key, default_option)
         selection = st.selectbox(
             display_label,
             options=choices,
-            index=index,
             key=widget_key,
             help=help_text,
             format_func=lambda value: labels.get(value, value)
@@ -3075,6 +3234,25 @@ def render_preview_question(
         st.warning(f"Unsupported question type: {question_type}")
 
 
+def _question_index(questions: Any, question: Dict[str, Any]) -> Optional[int]:
+    """Return the position of ``question`` in ``questions``.
+
+    The question is matched by identity first and by key otherwise, so a list
+    rebuilt between reruns still resolves to the edited entry.
+    """
+
+    if not isinstance(questions, list):
+        return None
+    for idx, existing in enumerate(questions):
+        if existing is question:
+            return idx
+    key = question.get("key")
+    for idx, existing in enumerate(questions):
+        if isinstance(existing, dict) and existing.get("key") == key:
+            return idx
+    return None
+
+
 def _rename_show_if_fields(schema: Dict[str, Any], old_key: str, new_key: str) -> None:
     """Update show_if rule field references when a question key changes."""
 
@@ -3163,6 +3341,8 @@ def validate_schema(schema: Dict[str, Any]) -> List[str]:
 def handle_save_draft(schema: Dict[str, Any]) -> None:
     """Save the current schema to a draft branch and ensure a PR exists."""
 
+    from lib.github_backend import create_branch, ensure_pr, put_file
+
     form_key, persistable, questionnaire_payload = schema_for_storage(schema)
     if not form_key:
         st.error("No questionnaire selected to save.")
@@ -3190,13 +3370,7 @@ def handle_save_draft(schema: Dict[str, Any]) -> None:
         st.error(f"Could not create draft branch: {exc}")
         return
 
-    backend = GitHubBackend(
-        token=config["token"],
-        repo=config["repo"],
-        path=resolve_remote_form_path(config["path"], form_key),
-        branch=branch,
-        api_url=config.get("api_url", "https://api.github.com"),
-    )
+    backend = get_backend(form_key, branch)
 
     try:
         sha = backend.get_file_sha()
@@ -3238,6 +3412,8 @@ def handle_save_draft(schema: Dict[str, Any]) -> None:
 def handle_publish(schema: Dict[str, Any]) -> None:
     """Publish the schema to the main branch or save locally if unavailable."""
 
+    from lib.github_backend import blob_sha, dumps_json, put_file
+
     form_key, persistable, questionnaire_payload = schema_for_storage(schema)
     if not form_key:
         st.error("No questionnaire selected to publish.")
@@ -3251,29 +3427,25 @@ def handle_publish(schema: Dict[str, Any]) -> None:
 
     config = get_github_config()
     if config is not None:
-        backend = GitHubBackend(
-            token=config["token"],
-            repo=config["repo"],
-            path=resolve_remote_form_path(config["path"], form_key),
-            branch=config.get("branch", "main"),
-            api_url=config.get("api_url", "https://api.github.com"),
-        )
+        backend = get_backend(form_key)
 
         sha_state_obj = st.session_state.get(SCHEMA_SHA_STATE_KEY, {})
         if not isinstance(sha_state_obj, dict):
             sha_state_obj = {}
         sha_state = sha_state_obj
-        stored_sha = sha_state.get(form_key)
-        try:
-            latest_sha = backend.get_file_sha()
-        except Exception as exc:  # pylint: disable=broad-except
-            st.error(f"Could not read schema from GitHub: {exc}")
-            return
+        # The SHA recorded at load time is sent as-is; GitHub rejects a stale
+        # one with 409, so the extra GET is only needed on conflict or when no
+        # SHA was recorded.
+        latest_sha = sha_state.get(form_key)
+        if latest_sha is None:
+            try:
+                latest_sha = backend.get_file_sha()
+            except Exception as exc:  # pylint: disable=broad-except
+                st.error(f"Could not read schema from GitHub: {exc}")
+                return
 
-        if stored_sha is not None and stored_sha != latest_sha:
-            st.error("Schema changed upstream—refresh and retry.")
-            sha_state[form_key] = latest_sha
-            st.session_state[SCHEMA_SHA_STATE_KEY] = sha_state
+        if latest_sha and latest_sha == blob_sha(dumps_json(persistable)):
+            st.info("No changes to publish.")
             return
 
         form_config = dict(config)
@@ -3288,7 +3460,16 @@ def handle_publish(schema: Dict[str, Any]) -> None:
                 branch=config.get("branch", "main"),
             )
         except Exception as exc:  # pylint: disable=broad-except
-            st.error(f"Could not publish schema to GitHub: {exc}")
+            if getattr(getattr(exc, "response", None), "status_code", None) != 409:
+                st.error(f"Could not publish schema to GitHub: {exc}")
+                return
+            try:
+                sha_state[form_key] = backend.get_file_sha()
+            except Exception as read_exc:  # pylint: disable=broad-except
+                st.error(f"Could not read schema from GitHub: {read_exc}")
+                return
+            st.error("Schema changed upstream—refresh and retry.")
+            st.session_state[SCHEMA_SHA_STATE_KEY] = sha_state
             return
 
         published_sha = None
@@ -3302,9 +3483,9 @@ def handle_publish(schema: Dict[str, Any]) -> None:
             sources: Dict[str, Path] = st.session_state.get(FORM_SOURCES_STATE_KEY, {})
             target_path = local_form_path(form_key, sources)
             target_path.parent.mkdir(parents=True, exist_ok=True)
-            with target_path.open("w", encoding="utf-8") as schema_file:
-                json.dump(persistable, schema_file, indent=2)
-                schema_file.write("\n")
+            temp_path = target_path.with_name(f"{target_path.name}.{os.getpid()}.tmp")
+            temp_path.write_bytes(dumps_json(persistable) + b"\n")
+            os.replace(temp_path, target_path)
             sources = dict(sources)
             sources[form_key] = target_path
             st.session_state[FORM_SOURCES_STATE_KEY] = sources
@@ -3335,13 +3516,12 @@ def render_question_editor(question: Dict[str, Any], schema: Dict[str, Any]) ->
     prefix = _state_prefix(schema)
     show_if_json_key = f"show_if_json_{prefix}_{original_key}" if prefix else f"show_if_json_{original_key}"
     show_if_json_override_key = f"{show_if_json_key}_override"
-    initial_show_if = (
-        json.dumps(question.get("show_if", {}), indent=2)
-        if question.get("show_if")
-        else ""
-    )
+    # The text area's state is seeded once; later edits come from the user or
+    # the rule builder's override, so the rule is only serialised here.
     if show_if_json_key not in st.session_state:
-        st.session_state[show_if_json_key] = initial_show_if
+        st.session_state[show_if_json_key] = (
+            _show_if_text(question["show_if"]) if question.get("show_if") else ""
+        )
 
     if show_if_json_override_key in st.session_state:
         st.session_state[show_if_json_key] = st.session_state.pop(
@@ -3351,10 +3531,7 @@ def render_question_editor(question: Dict[str, Any], schema: Dict[str, Any]) ->
     form_key = f"edit_{prefix}_{original_key}" if prefix else f"edit_{original_key}"
     existing_related_source = question.get("related_record_source")
     questions_list = schema.get("questions", [])
-    question_index = next(
-        (idx for idx, existing in enumerate(questions_list) if existing is question),
-        None,
-    )
+    question_index = _question_index(questions_list, question)
 
     display_name = (question.get("label", "") or original_key or "Question").strip()
     card_title = f"Edit question: {display_name}"
@@ -3458,7 +3635,7 @@ def render_question_editor(question: Dict[str, Any], schema: Dict[str, Any]) ->
                 show_if_raw = st.text_area(
                     "Show if (JSON)",
                     key=show_if_json_key,
-                    value=st.session_state.get(show_if_json_key, initial_show_if),
+                    value=st.session_state[show_if_json_key],
                     placeholder='{"all": [{"field": "previous_question", "operator": "equals", "value": "Yes"}]}',
                     help="JSON logic describing when the question should appear.",
                 )
@@ -3477,7 +3654,7 @@ def render_question_editor(question: Dict[str, Any], schema: Dict[str, Any]) ->
 
             duplicate_key = any(
                 existing.get("key") == new_key and existing is not question
-                for existing in schema.get("questions", [])
+                for existing in questions_list
             )
             if duplicate_key:
                 st.error("A question with this key already exists.")
@@ -3537,11 +3714,11 @@ def render_question_editor(question: Dict[str, Any], schema: Dict[str, Any]) ->
             elif "default" in question:
                 updated_question.pop("default", None)
 
-            for idx, existing in enumerate(schema.get("questions", [])):
-                if existing.get("key") == original_key:
-                    schema["questions"][idx] = updated_question
-                    question = schema["questions"][idx]
-                    break
+            if question_index is None:
+                st.error("Question not found; reload the editor and try again.")
+                return
+            questions_list[question_index] = updated_question
+            question = updated_question
 
             if new_key != original_key:
                 preview_state = st.session_state.get(PREVIEW_ANSWERS_STATE_KEY)
@@ -3586,7 +3763,7 @@ def render_question_editor(question: Dict[str, Any], schema: Dict[str, Any]) ->
                 )
                 st.session_state[new_show_if_json_key] = st.session_state.pop(
                     show_if_json_key,
-                    json.dumps(question.get("show_if", {}), indent=2)
+                    _show_if_text(question["show_if"])
                     if question.get("show_if")
                     else "",
                 )
@@ -3598,9 +3775,13 @@ def render_question_editor(question: Dict[str, Any], schema: Dict[str, Any]) ->
             st.success("Question updated. Use Publish or Save as Draft to persist changes.")
 
         if delete_requested:
-            schema["questions"] = [
-                q for q in schema.get("questions", []) if q.get("key") != original_key
-            ]
+            # Delete in place: ``schema["questions"]`` is the selected
+            # questionnaire's own list, and rebinding it would drop the change
+            # on the next rerun.
+            if question_index is None:
+                st.error("Question not found; reload the editor and try again.")
+                return
+            del questions_list[question_index]
             preview_state = st.session_state.get(PREVIEW_ANSWERS_STATE_KEY)
             active_id = _active_questionnaire_id(schema)
             if isinstance(preview_state, dict):
@@ -3622,11 +3803,9 @@ def render_question_editor(question: Dict[str, Any], schema: Dict[str, Any]) ->
             for session_key in list(st.session_state.keys()):
                 if session_key.endswith(target_suffix):
                     st.session_state.pop(session_key)
-            remaining_questions = schema.get("questions", [])
-            if isinstance(remaining_questions, list) and remaining_questions:
-                fallback_index = question_index if question_index is not None else 0
-                fallback_index = max(0, min(fallback_index, len(remaining_questions) - 1))
-                st.session_state[ACTIVE_QUESTION_STATE_KEY] = remaining_questions[
+            if isinstance(questions_list, list) and questions_list:
+                fallback_index = min(question_index, len(questions_list) - 1)
+                st.session_state[ACTIVE_QUESTION_STATE_KEY] = questions_list[
                     fallback_index
                 ].get("key")
             else:
@@ -3643,6 +3822,7 @@ def render_add_question(schema: Dict[str, Any]) -> None:
 
     prefix = _state_prefix(schema)
     form_key = f"add_question_{prefix}" if prefix else "add_question"
+    questions_list = schema.setdefault("questions", [])
     with section_card(
         "Add new question",
         "Configure the essentials, then fine-tune defaults and behaviour.",
@@ -3727,7 +3907,7 @@ def render_add_question(schema: Dict[str, Any]) -> None:
             if not key:
                 st.error("Key is required.")
                 return
-            if any(question.get("key") == key for question in schema.get("questions", [])):
+            if any(question.get("key") == key for question in questions_list):
                 st.error("A question with this key already exists.")
                 return
             if question_type in {"single", "multiselect"} and not options:
@@ -3761,7 +3941,7 @@ def render_add_question(schema: Dict[str, Any]) -> None:
             if prepared_default is not None:
                 new_question["default"] = prepared_default
 
-            schema.setdefault("questions", []).append(new_question)
+            questions_list.append(new_question)
             st.session_state[SCHEMA_STATE_KEY] = schema
             st.session_state[ACTIVE_QUESTION_STATE_KEY] = key
             st.success("Question added. Use Publish or Save as Draft to persist changes.")
@@ -3840,27 +4020,29 @@ def main() -> None:
     render_risk_overview(schema, active_key=active_risk_key)
     st.divider()
 
-    with st.expander("Live Preview", expanded=False):
-        preview_state: Dict[str, Dict[str, Any]] = st.session_state.setdefault(
-            PREVIEW_ANSWERS_STATE_KEY,
-            {},
-        )
-        preview_answers = preview_state.setdefault(selected_key, {})
-        if not questions:
-            st.info("Add questions to see the live preview.")
-        else:
-            st.caption(
-                "Interact with the questions below to preview the questionnaire using the current in-memory schema."
+    # Rendering every preview widget is the costliest part of a rerun, so it
+    # only happens while the preview is switched on (see "View raw schema").
+    if st.toggle("Live Preview", key="editor_show_live_preview"):
+        with st.container(border=True):
+            preview_state: Dict[str, Dict[str, Any]] = st.session_state.setdefault(
+                PREVIEW_ANSWERS_STATE_KEY,
+                {},
             )
-            active_keys = set()
-            for question in questions:
-                render_preview_question(question, preview_answers, prefix=_state_prefix(schema))
-                active_keys.add(question.get("key"))
-            for key in list(preview_answers.keys()):
-                if key not in active_keys:
+            preview_answers = preview_state.setdefault(selected_key, {})
+            if not questions:
+                st.info("Add questions to see the live preview.")
+            else:
+                st.caption(
+                    "Interact with the questions below to preview the questionnaire using the current in-memory schema."
+                )
+                active_keys = set()
+                for question in questions:
+                    render_preview_question(question, preview_answers, prefix=_state_prefix(schema))
+                    active_keys.add(question.get("key"))
+                for key in preview_answers.keys() - active_keys:
                     preview_answers.pop(key, None)
-        preview_state[selected_key] = preview_answers
-        st.session_state[PREVIEW_ANSWERS_STATE_KEY] = preview_state
+            preview_state[selected_key] = preview_answers
+            st.session_state[PREVIEW_ANSWERS_STATE_KEY] = preview_state
 
     if questions:
         selected_question = next(
@@ -3888,7 +4070,9 @@ def main() -> None:
 
     render_add_risk(schema)
 
-    with st.expander("View raw schema"):
+    # A collapsed expander still builds and ships its contents on every rerun;
+    # a toggle lets the deep copy and JSON payload be skipped until requested.
+    if st.toggle("View raw schema", key="editor_show_raw_schema"):
         _, persistable_preview, _ = schema_for_storage(schema)
         st.json(persistable_preview)
 
@@ -259,3 +259,66 @@ def test_store_assessment_submission_missing_github(monkeypatch):
 
     assert submission_id is None
     assert errors, "Expected an error message when GitHub is not configured"
+
+
+def test_collect_triggered_risks_returns_independent_copies():
+    """Mutating a returned risk should not leak into later submissions."""
+
+    import importlib
+
+    questionnaire = importlib.import_module("pages.01_Questionnaire")
+
+    risks = [
+        {
+            "key": "copy-risk",
+            "logic": {"field": "flag", "operator": "equals", "value": "yes"},
+            "mitigations": ["Review access"],
+        }
+    ]
+
+    first = questionnaire._collect_triggered_risks({"flag": "yes"}, "copy-digest", risks)
+    first[0]["mitigations"].append("Injected")
+    first[0]["key"] = "changed"
+
+    second = questionnaire._collect_triggered_risks({"flag": "yes"}, "copy-digest", risks)
+    assert second == [{"key": "copy-risk", "mitigations": ["Review access"]}]
+
+
+def test_store_assessment_submission_uses_supplied_risks(monkeypatch):
+    """Risks resolved by the page should be used without reloading the schema."""
+
+    import importlib
+
+    questionnaire = importlib.import_module("pages.01_Questionnaire")
+
+    captured = {}
+
+    class DummyBackend:
+        def __init__(self, **kwargs) -> None:
+            pass
+
+        def write_json(self, data, message):
+            captured["payload"] = data
+            return {"ok": True}
+
+    def fail_load_schema():
+        raise AssertionError("load_schema should not be called")
+
+    settings = {"token": "secret-token", "repo": "example/repo"}
+    risks = [
+        {
+            "key": "page-risk",
+            "logic": {"field": "flag", "operator": "equals", "value": "yes"},
+        }
+    ]
+
+    monkeypatch.setattr(questionnaire, "GitHubBackend", DummyBackend)
+    monkeypatch.setattr(questionnaire, "_github_settings", lambda: settings)
+    monkeypatch.setattr(questionnaire, "load_schema", fail_load_schema)
+
+    submission_id = questionnaire.store_assessment_submission(
+        {"flag": "yes"}, digest="page-digest", risks=risks
+    )
+
+    assert submission_id
+    assert captured["payload"]["risks"] == [{"key": "page-risk"}]
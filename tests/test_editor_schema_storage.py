@@ -7,6 +7,7 @@ from pathlib import Path
 import sys
 from typing import Any, Dict
 
+import pytest
 import streamlit as st
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -96,3 +97,51 @@ def test_schema_for_storage_includes_risks_in_nested_payload() -> None:
     assert persistable["questionnaire"]["risks"] == schema["risks"]
     assert persistable["meta"] == {"foo": "bar"}
     assert questionnaire["risks"] == schema["risks"]
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("label", "Owner’s name"), ("weight", 1e16), ("threshold", 1e-7)],
+)
+def test_handle_publish_skips_byte_identical_remote_file(monkeypatch, field, value) -> None:
+    """Publishing should be skipped when GitHub already holds the same bytes."""
+
+    import hashlib
+    import json
+
+    from lib import github_backend
+
+    _clear_session_state()
+    schema = _base_schema()
+    schema["questionnaires"]["demo"]["questions"][0][field] = value
+
+    _, persistable, _ = EDITOR.schema_for_storage(schema)
+    # The remote file was written by the standard-library encoder.
+    remote = json.dumps(persistable, indent=2).encode("utf-8")
+    remote_sha = hashlib.sha1(f"blob {len(remote)}\0".encode("ascii") + remote).hexdigest()
+    st.session_state[EDITOR.SCHEMA_SHA_STATE_KEY] = {"demo": remote_sha}
+
+    infos = []
+
+    def fail_put_file(*args, **kwargs):
+        raise AssertionError("put_file should not be called")
+
+    monkeypatch.setattr(EDITOR, "get_github_config", lambda: {"path": "schema.json"})
+    monkeypatch.setattr(EDITOR, "get_backend", lambda form_key: None)
+    monkeypatch.setattr(github_backend, "put_file", fail_put_file)
+    monkeypatch.setattr(EDITOR.st, "info", infos.append)
+
+    EDITOR.handle_publish(schema)
+
+    assert infos == ["No changes to publish."]
+
+
+def test_question_index_falls_back_to_key_match() -> None:
+    """Edited questions should be found even when the list was rebuilt."""
+
+    question = {"key": "q2", "label": "Second"}
+    questions = [{"key": "q1"}, question]
+
+    assert EDITOR._question_index(questions, question) == 1
+    assert EDITOR._question_index([{"key": "q1"}, {"key": "q2"}], question) == 1
+    assert EDITOR._question_index([{"key": "q1"}], question) is None
@@ -0,0 +1,81 @@
+"""Tests for the GitHub Contents API helpers."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from lib import github_backend
+from lib.github_backend import GitHubBackend
+
+
+def _response(status_code, payload=None, headers=None):
+    def raise_for_status():
+        if status_code >= 400:
+            raise RuntimeError(f"HTTP {status_code}")
+
+    return SimpleNamespace(
+        status_code=status_code,
+        headers=headers or {},
+        json=lambda: payload,
+        raise_for_status=raise_for_status,
+    )
+
+
+def test_get_file_sha_revalidates_with_etag(monkeypatch):
+    """A 304 should return the SHA remembered from the previous lookup."""
+
+    calls = []
+    responses = [
+        _response(200, {"sha": "abc123"}, {"ETag": 'W/"tag"'}),
+        _response(304),
+    ]
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        calls.append(dict(headers or {}))
+        return responses.pop(0)
+
+    monkeypatch.setattr(github_backend.requests, "get", fake_get)
+    backend = GitHubBackend(token="secret", repo="org/repo", path="schema.json")
+
+    assert backend.get_file_sha() == "abc123"
+    assert backend.get_file_sha() == "abc123"
+    assert "If-None-Match" not in calls[0]
+    assert calls[1]["If-None-Match"] == 'W/"tag"'
+
+
+def test_dumps_json_matches_stdlib_indentation():
+    """Serialised schemas should keep the two-space layout and ASCII escapes."""
+
+    data = {"label": "Café’s 😀", "options": ["a", "b"], "nested": {"empty": []}}
+
+    expected = '{\n  "label": "Caf\\u00e9\\u2019s \\ud83d\\ude00",\n  "options": [\n    "a",\n    "b"\n  ],\n  "nested": {\n    "empty": []\n  }\n}'
+    assert github_backend.dumps_json(data).decode("ascii") == expected
+    assert github_backend.dumps_json(data) == json.dumps(data, indent=2).encode("utf-8")
+
+
+def test_dumps_json_fallback_matches_orjson_output(monkeypatch):
+    """The stdlib fallback should produce the same bytes as the orjson path."""
+
+    data = {"label": "Risk’s owner", "weights": [1, 2.5]}
+    fast = github_backend.dumps_json(data)
+
+    monkeypatch.setattr(github_backend, "orjson", None)
+    assert github_backend.dumps_json(data) == fast
+
+
+@pytest.mark.parametrize("value", [1e16, 1e-7, float("nan"), float("inf"), -0.0, 0.1])
+def test_dumps_json_matches_stdlib_floats(value):
+    """Floats the two encoders format differently should use the stdlib output."""
+
+    data = {"weights": [value], "nested": {"score": value}}
+
+    assert github_backend.dumps_json(data) == json.dumps(data, indent=2).encode("utf-8")
+
+
+def test_blob_sha_matches_git_hash_object():
+    """Content hashes should match the SHAs GitHub reports for files."""
+
+    assert github_backend.blob_sha(b"hello\n") == "ce013625030ba8dba906f756967f9e9ca394464a"
@@ -0,0 +1,134 @@
+"""Tests for fetching questionnaire schemas from GitHub."""
+
+from __future__ import annotations
+
+import importlib
+from types import SimpleNamespace
+
+
+def _response(status_code, text="", headers=None):
+    def raise_for_status():
+        if status_code >= 400:
+            raise RuntimeError(f"HTTP {status_code}")
+
+    return SimpleNamespace(
+        status_code=status_code,
+        content=text.encode("utf-8"),
+        headers=headers or {},
+        raise_for_status=raise_for_status,
+    )
+
+
+def test_get_file_revalidates_with_etag(monkeypatch, tmp_path):
+    """Unchanged files should be served from the ETag store after a 304."""
+
+    questionnaire = importlib.import_module("pages.01_Questionnaire")
+    questionnaire.get_file.clear()
+    questionnaire._etag_store.clear()
+
+    calls = []
+    responses = [
+        _response(200, '{"questions": []}', {"ETag": '"abc"'}),
+        _response(304),
+    ]
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        calls.append({"url": url, "headers": dict(headers or {}), "params": params})
+        return responses.pop(0)
+
+    monkeypatch.setattr(questionnaire, "SCHEMA_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(questionnaire, "_github_settings", lambda: {"token": "secret"})
+    monkeypatch.setattr(questionnaire, "_http_session", lambda: SimpleNamespace(get=fake_get))
+
+    key = questionnaire.GHFetchKey(repo="example/repo", path="forms/a.json", ref="main")
+    assert questionnaire.get_file(key) == b'{"questions": []}'
+
+    questionnaire.get_file.clear()
+    assert questionnaire.get_file(key) == b'{"questions": []}'
+
+    assert calls[0]["url"] == "https://api.github.com/repos/example/repo/contents/forms/a.json"
+    assert calls[0]["params"] == {"ref": "main"}
+    assert "If-None-Match" not in calls[0]["headers"]
+    assert calls[1]["headers"]["If-None-Match"] == '"abc"'
+    assert calls[1]["headers"]["Authorization"] == "Bearer secret"
+
+
+def test_get_file_revalidates_from_disk_cache(monkeypatch, tmp_path):
+    """A persisted ETag should be reused once the in-memory store is empty."""
+
+    questionnaire = importlib.import_module("pages.01_Questionnaire")
+    questionnaire.get_file.clear()
+    questionnaire._etag_store.clear()
+
+    calls = []
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        calls.append(dict(headers or {}))
+        return _response(304)
+
+    monkeypatch.setattr(questionnaire, "SCHEMA_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(questionnaire, "_github_settings", lambda: {})
+    monkeypatch.setattr(questionnaire, "_http_session", lambda: SimpleNamespace(get=fake_get))
+
+    key = questionnaire.GHFetchKey(repo="example/repo", path="forms/b.json", ref="main")
+    questionnaire._write_disk_cache(key, '"disk"', b'{"questions": [1]}')
+
+    assert questionnaire.get_file(key) == b'{"questions": [1]}'
+    assert calls[0]["If-None-Match"] == '"disk"'
+
+
+def test_get_file_without_token_uses_raw_endpoint(monkeypatch, tmp_path):
+    """Unauthenticated downloads should avoid the rate-limited REST API."""
+
+    questionnaire = importlib.import_module("pages.01_Questionnaire")
+    questionnaire.get_file.clear()
+    questionnaire._etag_store.clear()
+
+    calls = []
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        calls.append({"url": url, "headers": dict(headers or {}), "params": params})
+        return _response(200, '{"questions": []}', {"ETag": '"raw"'})
+
+    monkeypatch.setattr(questionnaire, "SCHEMA_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(questionnaire, "_github_settings", lambda: {})
+    monkeypatch.setattr(questionnaire, "_http_session", lambda: SimpleNamespace(get=fake_get))
+
+    key = questionnaire.GHFetchKey(repo="example/repo", path="forms/c.json", ref="dev")
+    assert questionnaire.get_file(key) == b'{"questions": []}'
+
+    assert calls[0]["url"] == "https://raw.githubusercontent.com/example/repo/dev/forms/c.json"
+    assert calls[0]["params"] is None
+    assert "Authorization" not in calls[0]["headers"]
+
+
+def test_malformed_remote_schema_falls_back(monkeypatch):
+    """A remote form whose questions are not objects should not be used."""
+
+    questionnaire = importlib.import_module("pages.01_Questionnaire")
+    questionnaire._load_remote_schema.clear()
+
+    settings = {"repo": "example/repo", "path": "forms/{form_key}.json", "forms": ["assessment"]}
+    monkeypatch.setattr(questionnaire, "_github_settings", lambda: settings)
+    monkeypatch.setattr(questionnaire, "get_file", lambda key: b'{"questions": [1, null]}')
+
+    schema, error = questionnaire._load_github_schema()
+
+    assert schema == {}
+    assert error is not None and "Falling back" in error
+
+
+def test_unexpected_remote_errors_fall_back(monkeypatch):
+    """Type errors raised while reading the remote schema should not crash the page."""
+
+    questionnaire = importlib.import_module("pages.01_Questionnaire")
+
+    def broken_load():
+        raise AttributeError("'list' object has no attribute 'get'")
+
+    monkeypatch.setattr(questionnaire, "load_schema_from_github", broken_load)
+
+    schema, error = questionnaire._load_github_schema()
+
+    assert schema == {}
+    assert error is not None and "Falling back" in error
@@ -0,0 +1,92 @@
+"""Tests for evaluating questionnaire visibility and risk rules."""
+
+from __future__ import annotations
+
+import importlib
+
+import pytest
+
+questionnaire = importlib.import_module("pages.01_Questionnaire")
+
+
+@pytest.mark.parametrize(
+    "clause,answers,expected",
+    [
+        ({"operator": "always"}, {}, True),
+        ({"field": "q", "operator": "equals", "value": "Yes"}, {"q": "Yes"}, True),
+        ({"field": "q", "operator": "equals", "value": "Yes"}, {"q": "No"}, False),
+        ({"field": "q", "operator": "not_equals", "value": "Yes"}, {}, True),
+        ({"field": "q", "operator": "includes", "value": "a"}, {"q": ["a", "b"]}, True),
+        ({"field": "q", "operator": "includes", "value": "a"}, {}, False),
+        ({"field": "q", "operator": "not_includes", "value": "a"}, {"q": ["b"]}, True),
+        ({"field": "q", "operator": "not_includes", "value": "a"}, {}, True),
+        ({"field": "q", "operator": "any_selected", "value": ["a", "c"]}, {"q": ["c"]}, True),
+        ({"field": "q", "operator": "any_selected", "value": ["a"]}, {"q": "a"}, False),
+        ({"field": "q", "operator": "all_selected", "value": ["a", "b"]}, {"q": ["a", "b"]}, True),
+        ({"field": "q", "operator": "all_selected", "value": ["a", "b"]}, {"q": ["a"]}, False),
+        ({"field": "q", "operator": "contains_any", "value": ["foo"]}, {"q": "a foo b"}, True),
+        ({"field": "q", "operator": "contains_any", "value": "x"}, {"q": ["x"]}, True),
+        ({"field": "q", "operator": "contains_any", "value": None}, {"q": "x"}, False),
+        ({"field": "q", "operator": "is_true"}, {"q": True}, True),
+        ({"field": "q", "operator": "is_false"}, {}, True),
+    ],
+)
+def test_eval_clause_operators(clause, answers, expected) -> None:
+    assert questionnaire.eval_clause(clause, answers) is expected
+
+
+def test_eval_rule_combines_groups() -> None:
+    rule = {
+        "any": [
+            {"all": [{"field": "a", "operator": "equals", "value": 1}, {"field": "b", "operator": "is_true"}]},
+            {"field": "c", "operator": "equals", "value": "yes"},
+        ]
+    }
+
+    assert questionnaire.eval_rule(rule, {"a": 1, "b": True}) is True
+    assert questionnaire.eval_rule(rule, {"a": 1, "b": False}) is False
+    assert questionnaire.eval_rule(rule, {"c": "yes"}) is True
+    assert questionnaire.eval_rule({}, {}) is True
+
+
+def test_should_show_question_reuses_compiled_rule() -> None:
+    question = {"key": "q2", "show_if": {"field": "q1", "operator": "equals", "value": "Yes"}}
+    questionnaire.compile_rule.cache_clear()
+
+    assert questionnaire.should_show_question(question, {"q1": "Yes"}) is True
+    assert questionnaire.should_show_question(question, {"q1": "No"}) is False
+    assert questionnaire.compile_rule.cache_info().misses == 1
+    assert questionnaire.should_show_question({"key": "q3"}, {}) is True
+
+
+def test_selection_operators_handle_unhashable_values() -> None:
+    clause = {"field": "q", "operator": "any_selected", "value": [["a"], "b"]}
+
+    assert questionnaire.eval_clause(clause, {"q": [["a"]]}) is True
+    assert questionnaire.eval_clause(clause, {"q": ["c"]}) is False
+
+
+def test_form_start_keeps_gating_questions_outside_form() -> None:
+    questions = [
+        {"key": "q1"},
+        {"key": "q2", "show_if": {"any": [{"field": "q1", "operator": "is_true"}]}},
+        {"key": "q3", "show_if": {"all": [{"field": "q2", "operator": "equals", "value": "x"}]}},
+        {"key": "q4"},
+    ]
+
+    dependents = questionnaire.question_dependents(questions)
+
+    assert dependents == {"q1": ("q2",), "q2": ("q3",)}
+    assert questionnaire._form_start(questions, dependents) == 2
+    assert questionnaire._form_start([{"key": "a"}, {"key": "b"}], {}) == 0
+
+
+def test_render_item_precompiles_show_if() -> None:
+    item = questionnaire._render_item(
+        "form", {"key": "q2", "show_if": {"field": "q1", "operator": "equals", "value": "Yes"}}
+    )
+
+    assert item.show_if({"q1": "Yes"}) is True
+    assert item.show_if({"q1": "No"}) is False
+    assert item.widget_key == "form_question_q2"
+    assert questionnaire._render_item("form", {"key": "q3"}).show_if is None
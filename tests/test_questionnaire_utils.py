@@ -64,3 +64,13 @@ def test_constants_available_while_module_initialises(monkeypatch) -> None:
     monkeypatch.setattr(builtins, "__import__", intercept)
 
     importlib.import_module("lib.questionnaire_utils")
+
+
+def test_schema_digest_ignores_stored_digest() -> None:
+    utils = importlib.import_module("lib.questionnaire_utils")
+
+    schema = {"questionnaires": {"a": {"questions": [{"key": "q1"}]}}}
+    digest = utils.schema_digest(schema)
+
+    assert digest == utils.schema_digest({**schema, utils.SCHEMA_DIGEST_KEY: digest})
+    assert digest != utils.schema_digest({"questionnaires": {"a": {"questions": []}}})
@@ -67,3 +67,80 @@ def test_generate_group_label_skips_existing_names() -> None:
 def test_generate_group_label_defaults(existing, expected) -> None:
     label = EDITOR._generate_group_label(existing)  # type: ignore[attr-defined]
     assert label == expected
+
+
+def test_eval_rule_dispatches_operators() -> None:
+    answers = {"role": "admin", "tags": ["a", "b"], "notes": "needs review", "flag": True}
+    rule = {
+        "all": [
+            {"field": "tags", "operator": "all_selected", "value": ["a", "b"]},
+            {"field": "notes", "operator": "contains_any", "value": ["review"]},
+            {"field": "flag", "operator": "is_true"},
+        ]
+    }
+
+    assert EDITOR.eval_rule({"field": "role", "operator": "equals", "value": "admin"}, answers)  # type: ignore[attr-defined]
+    assert EDITOR.eval_rule(rule, answers)  # type: ignore[attr-defined]
+    assert not EDITOR.eval_rule({"field": "tags", "operator": "includes", "value": "c"}, answers)  # type: ignore[attr-defined]
+    assert EDITOR.eval_rule({"operator": "always"}, {})  # type: ignore[attr-defined]
+
+
+def test_should_show_question_tracks_rule_edits() -> None:
+    clause = {"field": "tags", "operator": "includes", "value": "a"}
+    question = {"key": "q2", "show_if": {"all": [clause]}}
+
+    assert EDITOR.should_show_question(question, {"tags": ["a"]})  # type: ignore[attr-defined]
+
+    clause["value"] = "b"
+
+    assert not EDITOR.should_show_question(question, {"tags": ["a"]})  # type: ignore[attr-defined]
+    assert EDITOR.should_show_question(question, {"tags": ["b"]})  # type: ignore[attr-defined]
+
+
+def test_iter_rule_fields_preserves_document_order() -> None:
+    rule = {
+        "all": [
+            {"field": "a", "operator": "equals", "value": "x"},
+            {"any": [{"field": "b", "operator": "is_true"}, {"field": "c", "operator": "is_false"}]},
+            {"field": "d", "operator": "includes", "value": "y"},
+        ]
+    }
+
+    assert EDITOR.iter_rule_fields(rule) == ["a", "b", "c", "d"]  # type: ignore[attr-defined]
+
+
+def test_should_show_question_reuses_predicate_for_unchanged_rule() -> None:
+    rule = {"field": "flag", "operator": "is_true"}
+
+    first = EDITOR._rule_predicate(rule)  # type: ignore[attr-defined]
+    assert EDITOR._rule_predicate(rule) is first  # type: ignore[attr-defined]
+
+    rule["operator"] = "is_false"
+
+    assert EDITOR._rule_predicate(rule) is not first  # type: ignore[attr-defined]
+    assert EDITOR.should_show_question({"key": "q", "show_if": rule}, {"flag": False})  # type: ignore[attr-defined]
+
+
+def test_preview_multiselect_keeps_valid_selections(monkeypatch) -> None:
+    st = EDITOR.st  # type: ignore[attr-defined]
+    widget_key = "preview_question_tags"
+    st.session_state[widget_key] = ["a", "removed", "c"]
+    monkeypatch.setattr(st, "multiselect", lambda *args, key, **kwargs: st.session_state[key])
+
+    question = {"key": "tags", "type": "multiselect", "options": ["a", "b", "c"], "default": ["b"]}
+    answers: dict = {}
+    EDITOR.render_preview_question(question, answers)  # type: ignore[attr-defined]
+
+    assert answers["tags"] == ["a", "c"]
+    assert st.session_state[widget_key] == ["a", "c"]
+    del st.session_state[widget_key]
+
+
+def test_iter_rule_fields_walks_every_group_key() -> None:
+    rule = {
+        "all": [{"field": "a", "operator": "is_true"}],
+        "any": [{"none": [{"field": "b", "operator": "is_true"}]}],
+        "none": [{"all": [{"field": "c", "operator": "equals", "value": "x"}]}],
+    }
+
+    assert EDITOR.iter_rule_fields(rule) == ["a", "b", "c"]  # type: ignore[attr-defined]